@@ -0,0 +1,151 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Memory allocated by the X11 tracker's event path, no X server needed:
+# synthetic MotionNotify:s (& some LeaveNotify:s) are fed through
+# MoveEvent._drain & _dispatch. The few Xlib calls which need a server
+# (XPending, XNextEvent, XSendEvent & display locking) are replaced.
+# The floor is the peak of those calls alone: ctypes allocates while
+# converting the arguments of each foreign call, which the tracker can't
+# avoid.
+#
+# Usage: python bench/alloc.py [--batches N] [--json]
+#
+# For each batch size reports the peak bytes allocated per event while a
+# batch is drained & dispatched, its floor, and the bytes retained per
+# event after all batches (tracemalloc).
+#
+import os, sys, json, argparse, tracemalloc
+from ctypes import memmove, sizeof, byref
+
+sys.path.insert( 0, os.path.dirname( os.path.dirname(
+	os.path.abspath( __file__ ) ) ) )
+import driver.X11 as x11
+
+HANDLE = 0x3a00007
+SIZE = sizeof( x11.XEvent )
+
+# Stands in for libX11, serves pending events from a list of XEvents:
+class FakeX( object ):
+	def __init__( self, lib, events ):
+		self.lib = lib
+		self.events = [byref( e ) for e in events]
+		self.pending = 0
+		self.i = 0
+
+	def __getattr__( self, name ): return getattr( self.lib, name )
+
+	def XPending( self, disp ): return self.pending
+
+	def XNextEvent( self, disp, ref ):
+		memmove( ref, self.events[self.i % len( self.events )], SIZE )
+		self.i += 1
+		self.pending -= 1
+
+	def XSendEvent( self, *args ): return 1
+	def XLockDisplay( self, disp ): pass
+	def XUnlockDisplay( self, disp ): pass
+
+def events( n ):
+	es = []
+	for i in range( n ):
+		e = x11.XEvent()
+		leave = i % 50 == 49
+		e.type = x11.LeaveNotify if leave else x11.MotionNotify
+		e.xany.window = HANDLE
+		e.xmotion.x, e.xmotion.y = i % 800, 300
+		es.append( e )
+	return es
+
+# A Driver with HANDLE bound to id 1, without a display:
+def driver():
+	D = x11.Driver.__new__( x11.Driver )
+	x11.DriverMeta.__init__( D )
+	D.disp = None
+	D.sensors = None
+	D.event_mask = x11.EventMask
+	D.inside, D.focused, D.masks = set(), set(), {}
+	D.win_map.bind( HANDLE, 1 )
+	return D
+
+# Peak & retained bytes of running batch() batches times:
+def measure( batch, batches ):
+	for _ in range( 100 ): batch()
+	tracemalloc.start()
+	base = tracemalloc.get_traced_memory()[0]
+	peak = 0
+	for _ in range( batches ):
+		tracemalloc.reset_peak()
+		batch()
+		peak = max( peak, tracemalloc.get_traced_memory()[1] - base )
+	retained = tracemalloc.get_traced_memory()[0] - base
+	tracemalloc.stop()
+	return peak, retained
+
+def run( size, batches ):
+	fake = FakeX( x11.X11, events( 1000 ) )
+	x11.X11 = fake
+	try:
+		T = x11.MoveEvent( driver(), lambda *a: None, lambda *a: None,
+						   batch = True )
+		def batch():
+			fake.pending = size
+			while fake.pending: T._dispatch( T._drain( None ) )
+
+		# The Xlib calls of a batch, without the tracker:
+		ref = T.events[0].ref
+		def xlib():
+			fake.pending = size
+			fake.XLockDisplay( None )
+			while fake.XPending( None ): fake.XNextEvent( None, ref )
+			fake.XUnlockDisplay( None )
+			for _ in range( size ):
+				fake.XLockDisplay( None )
+				fake.XSendEvent( None, HANDLE, 0, 0, ref )
+				fake.XUnlockDisplay( None )
+
+		peak, retained = measure( batch, batches )
+		floor, _ = measure( xlib, batches )
+		return {"batch": size, "peak_bytes_per_event": peak / size,
+				"floor_bytes_per_event": floor / size,
+				"retained_bytes_per_event": retained / (size * batches)}
+	finally:
+		x11.X11 = fake.lib
+
+def main():
+	ap = argparse.ArgumentParser()
+	ap.add_argument( "--batches", type = int, default = 1000 )
+	ap.add_argument( "--json", action = "store_true" )
+	args = ap.parse_args()
+
+	rows = [run( size, args.batches ) for size in (1, 16, 256)]
+	if args.json: return print( json.dumps( rows, indent = 2 ) )
+	print( "%6s %22s %22s %26s" % ("batch", "peak bytes/event",
+		"floor bytes/event", "retained bytes/event") )
+	for r in rows:
+		print( "%6d %22.1f %22.1f %26.3f" % (r["batch"],
+			r["peak_bytes_per_event"], r["floor_bytes_per_event"],
+			r["retained_bytes_per_event"]) )
+
+if __name__ == "__main__": main()
@@ -0,0 +1,181 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# End to end hover latency of the X11 driver under Xvfb:
+# pointer injection (XTest) => MoveEvent's move/leave callbacks.
+#
+# Usage: python bench/latency.py [--backend core|xinput2|poll|sensors]
+#		 [--coordinates xlib|xcb] [--windows N] [--samples N] [--burst N]
+#		 [--no-batch] [--max-rate HZ] [--json]
+#
+# Reports latency percentiles, delivered events/sec for a burst, the CPU
+# time spent by the tracker thread and its CPU time over --idle seconds
+# of a resting pointer, and the time of a pointer_window query (see
+# --coordinates). Needs Xvfb and libXtst.
+#
+import json, time, argparse
+from threading import Event
+from xvfb import start_xvfb, x11_driver, StandIns, Pointer
+
+def percentiles( xs, ps = (50, 90, 99) ):
+	xs = sorted( xs )
+	r = {"p%d" % p: xs[min( len( xs ) - 1, int( len( xs ) * p / 100 ) )]
+		 for p in ps}
+	r["max"] = xs[-1]
+	return r
+
+# Hide/show boundaries the stand-ins report, as a hidden sidebar would:
+# samples reach the edge at x < 20. Places the sensors of that backend:
+SHOW_X, HIDE_X = 20, 300
+
+def thread_cpu( thread ):
+	return time.clock_gettime( time.pthread_getcpuclockid( thread.ident ) )
+
+class Probe( object ):
+	def __init__( self ):
+		self.event = Event()
+		self.moves = 0
+		self.leaves = 0
+		self.last = None
+
+	def move( self, _id, x, y ):
+		self.moves += 1
+		self.last = time.perf_counter()
+		self.event.set()
+
+	def leave( self, _id ):
+		self.leaves += 1
+		self.last = time.perf_counter()
+		self.event.set()
+
+	# Seconds from t0 to the next callback, or None on timeout:
+	def wait( self, t0, timeout = 1.0 ):
+		if not self.event.wait( timeout ): return
+		self.event.clear()
+		return self.last - t0
+
+# Median latency of reaching the edge & leaving, per sample:
+def latencies( probe, pointer, standins, samples ):
+	moves, leaves, lost = [], [], 0
+	for i in range( samples ):
+		w = i % len( standins.windows )
+		for points, out in ((standins.at( w, i % 20, 300 ), moves),
+							(standins.outside(), leaves)):
+			probe.event.clear()
+			t0 = time.perf_counter()
+			pointer.move( *points )
+			dt = probe.wait( t0 )
+			if dt is None: lost += 1
+			else: out.append( dt * 1e3 )
+	return moves, leaves, lost
+
+# Blasts a sweep across window 0, returns (injected/s, delivered/s):
+def throughput( probe, pointer, standins, burst ):
+	delivered = probe.moves
+	t0 = time.perf_counter()
+	for i in range( burst ):
+		pointer.move( *standins.at( 0, 10 + i % 700, 100 + i % 400 ) )
+	injected = time.perf_counter() - t0
+
+	# Wait for the tracker to go quiet:
+	while probe.wait( 0, 0.2 ) is not None: pass
+	elapsed = probe.last - t0
+	return (burst / injected, (probe.moves - delivered) / elapsed)
+
+# Microseconds per D.pointer_window(), the pointer over window 0:
+def pointer_window( D, pointer, standins, n = 1000 ):
+	pointer.move( *standins.at( 0, 400, 300 ) )
+	time.sleep( 0.1 )
+	t0 = time.perf_counter()
+	for _ in range( n ): D.pointer_window()
+	return (time.perf_counter() - t0) / n * 1e6
+
+def main():
+	ap = argparse.ArgumentParser()
+	ap.add_argument( "--backend", default = "core" )
+	ap.add_argument( "--coordinates", default = "xlib" )
+	ap.add_argument( "--windows", type = int, default = 4 )
+	ap.add_argument( "--samples", type = int, default = 500 )
+	ap.add_argument( "--burst", type = int, default = 20000 )
+	ap.add_argument( "--no-batch", action = "store_true" )
+	ap.add_argument( "--max-rate", type = int, default = 0 )
+	ap.add_argument( "--idle", type = float, default = 2.0 )
+	ap.add_argument( "--json", action = "store_true" )
+	args = ap.parse_args()
+
+	xvfb = start_xvfb()
+	try:
+		X11 = x11_driver()
+		standins = StandIns( X11, args.windows )
+		pointer = Pointer( X11 )
+		pointer.move( *standins.outside() )
+
+		D = X11.Driver( coordinates = args.coordinates )
+		ids = range( 1, args.windows + 1 )
+		for _id in ids: D.register_new_window( _id )
+
+		probe = Probe()
+		T = D.tracker( probe.move, probe.leave, backend = args.backend,
+			batch = not args.no_batch, max_rate = args.max_rate )
+		for _id in ids: D.set_edges( _id, SHOW_X, HIDE_X, False )
+		T.start()
+		time.sleep( 0.2 )
+
+		cpu0 = thread_cpu( T )
+		moves, leaves, lost = latencies( probe, pointer, standins,
+			args.samples )
+		injected, delivered = throughput( probe, pointer, standins,
+			args.burst )
+		cpu = thread_cpu( T ) - cpu0
+
+		pointer.move( *standins.outside() )
+		time.sleep( 0.5 )
+		cpu0 = thread_cpu( T )
+		time.sleep( args.idle )
+		idle = (thread_cpu( T ) - cpu0) / args.idle
+		query = pointer_window( D, pointer, standins )
+		T.stopx()
+
+		report = {
+			"backend": type( T ).__name__,
+			"coordinates": "xcb" if D.xcb else "xlib",
+			"move_ms": percentiles( moves ) if moves else None,
+			"leave_ms": percentiles( leaves ) if leaves else None,
+			"lost": lost,
+			"injected_per_s": injected,
+			"delivered_per_s": delivered,
+			"tracker_cpu_s": cpu,
+			"idle_cpu_per_s": idle,
+			"pointer_window_us": query,
+			"events": probe.moves + probe.leaves,
+		}
+		if args.json: return print( json.dumps( report, indent = 2 ) )
+		for k, v in report.items():
+			if isinstance( v, dict ):
+				v = "  ".join( "%s=%.3f" % kv for kv in v.items() )
+			print( "%-16s %s" % (k, v) )
+	finally:
+		xvfb.terminate()
+
+if __name__ == "__main__": main()
@@ -0,0 +1,92 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Replays a recorded pointer trace ("record_trace_path") through main.py's
+# Wrapper against stand-in windows (see sim.py), at full speed.
+# Time is virtual and follows the trace, so relayout timers behave as live.
+#
+# Usage: python bench/replay.py TRACE [--width W] [--expect DIGEST] [--json]
+#
+# Prints the toggle decisions and their digest; with --expect, exits with
+# status 1 if the digest differs: a regression test of the toggle logic.
+#
+import sys, json, time, hashlib, argparse
+from sim import Sim
+from driver.record import read_trace, MOVE
+
+# Start replay after the plugin settled, in virtual ms:
+T0 = 10000
+
+# Sessions appended to one trace follow each other, the wall clock they
+# are stamped with may still have been set back in between: never rewind.
+def load( path ):
+	records = list( read_trace( path ) )
+	ids = sorted( set( r[1] for r in records ) )
+	index = {_id: i + 1 for i, _id in enumerate( ids )}
+	base = last = records[0][0] if records else 0
+	trace = []
+	for t, _id, x, y, kind in records:
+		last = max( last, t )
+		trace.append( (T0 + (last - base) * 1000,
+			"move" if kind == MOVE else "leave", index[_id], x, y) )
+	return trace, len( ids )
+
+def main():
+	ap = argparse.ArgumentParser()
+	ap.add_argument( "trace" )
+	ap.add_argument( "--width", type = int, default = 1600 )
+	ap.add_argument( "--expect" )
+	ap.add_argument( "--json", action = "store_true" )
+	args = ap.parse_args()
+
+	trace, windows = load( args.trace )
+	sim = Sim( max( windows, 1 ), width = args.width )
+	sim.reset_counts()
+
+	t0 = time.perf_counter()
+	sim.feed( trace )
+	elapsed = time.perf_counter() - t0
+	sim.unload()
+
+	toggles = [(round( t - T0, 3 ), _id, shown)
+			   for t, _id, shown in sim.state.toggles]
+	digest = hashlib.sha1( json.dumps( toggles ).encode() ).hexdigest()
+	report = {
+		"events": len( trace ),
+		"windows": windows,
+		"ns_per_event": elapsed / len( trace ) * 1e9 if trace else 0,
+		"toggles": len( toggles ),
+		"digest": digest,
+	}
+
+	if args.json: print( json.dumps( dict( report, decisions = toggles ) ) )
+	else:
+		for t, _id, shown in toggles:
+			print( "%12.3f ms  window %d  %s" %
+				(t, _id, "show" if shown else "hide") )
+		for k, v in report.items(): print( "%-14s %s" % (k, v) )
+
+	if args.expect and args.expect != digest: sys.exit( 1 )
+
+if __name__ == "__main__": main()
@@ -0,0 +1,290 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Headless simulation of the plugin: stand-in sublime / sublime_plugin
+# modules that count API calls, and SimDriver, a DriverMeta fed with
+# synthetic pointer traces instead of a display server.
+#
+# Time is virtual: set_timeout callbacks run when a trace reaches them.
+#
+import os, io, sys, re, json, types, heapq
+from collections import Counter
+from contextlib import redirect_stdout
+from importlib.machinery import ModuleSpec
+
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+if ROOT not in sys.path: sys.path.insert( 0, ROOT )
+from driver.base import DriverMeta, MoveEventMeta
+
+PACKAGE = "sublime_autohide_sidebar"
+SETTINGS = "sublime-autohide-sidebar.sublime-settings"
+
+"""
+Stand-in sublime API:
+"""
+
+# Shared state of the simulation, reset by Sim():
+class State( object ):
+	def __init__( self ):
+		self.calls = Counter()
+		self.commands = Counter()
+		self.now = 0
+		self.timers = []
+		self.seq = 0
+		self.windows = []
+		self.listeners = []
+		self.toggles = []
+
+state = State()
+
+def api( name ): state.calls[name] += 1
+
+class Settings( object ):
+	def __init__( self, values ):
+		self.values = dict( values )
+		self.callbacks = {}
+
+	def get( self, key, default = None ):
+		api( "settings.get" )
+		return self.values.get( key, default )
+
+	def set( self, key, value ):
+		self.values[key] = value
+		for cb in list( self.callbacks.values() ): cb()
+
+	def add_on_change( self, tag, cb ): self.callbacks[tag] = cb
+	def clear_on_change( self, tag ): self.callbacks.pop( tag, None )
+
+# Reads a .sublime-settings file (JSON with // comments):
+def read_settings( path ):
+	with open( path ) as f: text = f.read()
+	return json.loads( re.sub( r"^\s*//.*$", "", text, flags = re.M ) )
+
+class View( object ):
+	def __init__( self, window ):
+		self._window = window
+
+	def window( self ): return self._window
+
+	def sel( self ):
+		api( "view.sel" )
+		return [0]
+
+	def viewport_extent( self ):
+		api( "view.viewport_extent" )
+		w = self._window
+		return (w.width - w.gutter - (w.sidebar_width if w.sidebar else 0),
+				w.height)
+
+class Window( object ):
+	def __init__( self, _id, width = 1600, height = 900, sidebar = True,
+				  sidebar_width = 300, gutter = 60 ):
+		self._id = _id
+		self.width, self.height = width, height
+		self.sidebar = sidebar
+		self.sidebar_width = sidebar_width
+		self.gutter = gutter
+		self.view = View( self )
+		self._project_data = None
+
+	def id( self ): return self._id
+
+	def active_view( self ):
+		api( "window.active_view" )
+		return self.view
+
+	def is_sidebar_visible( self ):
+		api( "window.is_sidebar_visible" )
+		return self.sidebar
+
+	def project_data( self ):
+		api( "window.project_data" )
+		return self._project_data
+
+	def run_command( self, name, args = None ):
+		api( "window.run_command" )
+		state.commands[name] += 1
+		for l in state.listeners:
+			if hasattr( l, "on_window_command" ):
+				l.on_window_command( self, name, args )
+		if name == "toggle_side_bar":
+			self.sidebar = not self.sidebar
+			state.toggles.append( (state.now, self._id, self.sidebar) )
+		for l in state.listeners:
+			if hasattr( l, "on_post_window_command" ):
+				l.on_post_window_command( self, name, args )
+
+def set_timeout( fn, delay = 0 ):
+	state.seq += 1
+	heapq.heappush( state.timers, (state.now + delay, state.seq, fn) )
+
+def active_window(): return state.windows[0] if state.windows else None
+def windows(): return list( state.windows )
+def load_settings( name ): return state.settings
+
+def make_sublime():
+	m = types.ModuleType( "sublime" )
+	m.set_timeout = m.set_timeout_async = set_timeout
+	m.active_window, m.windows = active_window, windows
+	m.load_settings = load_settings
+	m.Settings, m.Window, m.View = Settings, Window, View
+	return m
+
+def make_sublime_plugin():
+	m = types.ModuleType( "sublime_plugin" )
+	class EventListener( object ): pass
+	class WindowCommand( object ):
+		def __init__( self, window ): self.window = window
+	m.EventListener, m.WindowCommand = EventListener, WindowCommand
+	return m
+
+"""
+Simulated driver:
+"""
+
+class SimTracker( MoveEventMeta ):
+	# No thread: events are fed synchronously by Sim.
+	def start( self ): self.alive = True
+
+class SimDriver( DriverMeta ):
+	def __init__( self, **opts ):
+		super().__init__()
+		self.calls = Counter()
+		self.pointer = None # (_id, x, y) or None
+
+	def _window( self, _id ):
+		return next( w for w in state.windows if w.id() == _id )
+
+	def window_width( self, _id ):
+		self.calls["window_width"] += 1
+		return self._window( _id ).width
+
+	def window_coordinates( self, _id ):
+		self.calls["window_coordinates"] += 1
+		p = self.pointer
+		return p[1:] if p and p[0] == _id else None
+
+	def pointer_window( self ):
+		self.calls["pointer_window"] += 1
+		return self.pointer
+
+	def register_new_window( self, _id ):
+		self.calls["register_new_window"] += 1
+		self.win_map.bind( _id, _id )
+
+	def register_windows( self, ids ):
+		self.calls["register_windows"] += 1
+		for _id in ids: self.win_map.bind( _id, _id )
+
+	def set_edges( self, _id, show_x, hide_x, shown ):
+		self.calls["set_edges"] += 1
+
+	def tracker( self, move, leave, resize = None, **opts ):
+		self.T = SimTracker( self, move, leave, resize )
+		return self.T
+
+"""
+Simulation:
+"""
+
+# Virtual monotonic clock, in seconds:
+def clock(): return state.now / 1000
+
+# Loads the plugin against the stand-ins & SimDriver, returns main:
+def load_plugin():
+	for name in list( sys.modules ):
+		if name == PACKAGE or name.startswith( PACKAGE + "." ):
+			del sys.modules[name]
+	sys.modules["sublime"] = make_sublime()
+	sys.modules["sublime_plugin"] = make_sublime_plugin()
+
+	pkg = types.ModuleType( PACKAGE )
+	pkg.__path__ = [ROOT]
+	pkg.__spec__ = ModuleSpec( PACKAGE, None, is_package = True )
+	sys.modules[PACKAGE] = pkg
+
+	# The driver package, minus its platform specific Driver:
+	drv = types.ModuleType( PACKAGE + ".driver" )
+	drv.__path__ = [os.path.join( ROOT, "driver" )]
+	drv.Driver = SimDriver
+	sys.modules[drv.__name__] = drv
+
+	# Timers & pointer speeds run on virtual time:
+	from importlib import import_module
+	main = import_module( PACKAGE + ".main" )
+	main.monotonic = sys.modules[PACKAGE + ".timerwheel"].monotonic = clock
+	return main
+
+class Sim( object ):
+	def __init__( self, windows = 1, settings = None, **window_opts ):
+		global state
+		state = State()
+		values = read_settings( os.path.join( ROOT, SETTINGS ) )
+		values.update( settings or {} )
+		state.settings = Settings( values )
+		state.windows = [Window( i + 1, **window_opts )
+						 for i in range( windows )]
+
+		self.main = load_plugin()
+		state.listeners = [v() for v in vars( self.main ).values()
+			if isinstance( v, type ) and v.__module__ == self.main.__name__
+			and hasattr( v, "on_window_command" )]
+		with redirect_stdout( io.StringIO() ): self.main.plugin_loaded()
+		self.D = self.main.D
+		self.advance( 1000 )
+
+	@property
+	def state( self ): return state
+
+	# Advances virtual time to ms, running due timers:
+	def advance( self, ms ):
+		while state.timers and state.timers[0][0] <= ms:
+			t, _, fn = heapq.heappop( state.timers )
+			state.now = max( state.now, t )
+			fn()
+		state.now = max( state.now, ms )
+
+	# Feeds a trace of (ms, kind, _id, x, y), kind in "move", "leave":
+	def feed( self, trace ):
+		T = self.D.T
+		for t, kind, _id, x, y in trace:
+			self.advance( t )
+			if kind == "move":
+				self.D.pointer = (_id, x, y)
+				T.move( _id, x, y )
+			else:
+				self.D.pointer = None
+				T.leave( _id )
+
+		# Drain what the tracker queued last:
+		self.advance( state.now )
+
+	def reset_counts( self ):
+		state.calls.clear()
+		state.commands.clear()
+		del state.toggles[:]
+		self.D.calls.clear()
+
+	def unload( self ):
+		with redirect_stdout( io.StringIO() ): self.main.plugin_unloaded()
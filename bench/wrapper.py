@@ -0,0 +1,107 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Microbenchmarks of main.py's Wrapper logic against the simulated driver
+# and stand-in sublime API (see sim.py), no display needed.
+#
+# Usage: python bench/wrapper.py [--events N] [--json]
+#
+# For each scripted scenario reports: ns per event, sublime API calls and
+# driver calls per event, and sidebar toggles per trace.
+#
+import json, time, argparse
+from sim import Sim
+
+# Scenarios: functions of (n, width, pad) => trace of (ms, kind, _id, x, y).
+# Events are 1ms apart, starting after the plugin settled.
+T0 = 10000
+
+# Pointer rests at the edge, then works in the editor, repeatedly:
+def edge_dwell( n, width, pad ):
+	trace = []
+	for i in range( n ):
+		phase = (i // 200) % 2
+		x = (i % pad) if not phase else width // 2 + (i % 50)
+		trace.append( (T0 + i, "move", 1, x, 300) )
+	return trace
+
+# Fast sweeps from edge to edge and back:
+def fast_sweep( n, width, pad ):
+	step = 40
+	xs = list( range( 0, width, step ) )
+	xs += xs[::-1]
+	return [(T0 + i, "move", 1, xs[i % len( xs )], 300) for i in range( n )]
+
+# Jitter around the show boundary:
+def jitter( n, width, pad ):
+	return [(T0 + i, "move", 1, pad + (1 if i % 2 else -1), 300)
+			for i in range( n )]
+
+# Moves inside the window with occasional leaves:
+def leaves( n, width, pad ):
+	return [(T0 + i, "leave", 1, 0, 0) if i % 100 == 99
+			else (T0 + i, "move", 1, (i * 7) % width, 300) for i in range( n )]
+
+SCENARIOS = [edge_dwell, fast_sweep, jitter, leaves]
+
+def run( scenario, n ):
+	sim = Sim()
+	w = sim.state.windows[0]
+	pad = sim.state.settings.values["hide_show_padding_x"]
+	trace = scenario( n, w.width, pad )
+	sim.reset_counts()
+
+	t0 = time.perf_counter()
+	sim.feed( trace )
+	elapsed = time.perf_counter() - t0
+	sim.unload()
+
+	calls = sum( sim.state.calls.values() )
+	return {
+		"scenario": scenario.__name__,
+		"events": n,
+		"ns_per_event": elapsed / n * 1e9,
+		"api_calls_per_event": calls / n,
+		"driver_calls_per_event": sum( sim.D.calls.values() ) / n,
+		"toggles": sim.state.commands["toggle_side_bar"],
+		"api_calls": dict( sim.state.calls ),
+	}
+
+def main():
+	ap = argparse.ArgumentParser()
+	ap.add_argument( "--events", type = int, default = 100000 )
+	ap.add_argument( "--json", action = "store_true" )
+	args = ap.parse_args()
+
+	results = [run( s, args.events ) for s in SCENARIOS]
+	if args.json: return print( json.dumps( results, indent = 2 ) )
+
+	print( "%-12s %12s %10s %10s %8s" %
+		("scenario", "ns/event", "api/event", "drv/event", "toggles") )
+	for r in results:
+		print( "%-12s %12.0f %10.4f %10.4f %8d" % (r["scenario"],
+			r["ns_per_event"], r["api_calls_per_event"],
+			r["driver_calls_per_event"], r["toggles"]) )
+
+if __name__ == "__main__": main()
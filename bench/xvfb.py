@@ -0,0 +1,114 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Benchmark helpers: a headless X server (Xvfb) with stand-in sublime
+# windows, acting as a minimal window manager (_NET_CLIENT_LIST), and
+# pointer injection through XTest.
+#
+import os, sys, time, subprocess
+from ctypes import *
+from ctypes.util import find_library
+
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+if ROOT not in sys.path: sys.path.insert( 0, ROOT )
+
+XA_CARDINAL = 6
+XA_WINDOW = 33
+PropModeReplace = 0
+
+# Starts Xvfb on a free display, sets $DISPLAY, returns the process:
+def start_xvfb( size = "1920x1080x24" ):
+	n = next( n for n in range( 99, 200 )
+			  if not os.path.exists( "/tmp/.X11-unix/X%d" % n ) )
+	p = subprocess.Popen( ["Xvfb", ":%d" % n, "-screen", "0", size,
+		"-nolisten", "tcp"], stdout = subprocess.DEVNULL,
+		stderr = subprocess.DEVNULL )
+	for _ in range( 100 ):
+		if os.path.exists( "/tmp/.X11-unix/X%d" % n ): break
+		if p.poll() is not None: sys.exit( "Xvfb failed to start." )
+		time.sleep( 0.05 )
+	os.environ["DISPLAY"] = ":%d" % n
+	return p
+
+# Imports the driver, after Xvfb is up. Xlib threads must come first:
+def x11_driver():
+	from driver import X11
+	X11.X11.XInitThreads()
+	return X11
+
+# Stand-in top level "sublime" windows on a connection of their own:
+class StandIns( object ):
+	def __init__( self, X11, count, size = (800, 600) ):
+		self.X = X11.X11
+		self.disp = self.X.XOpenDisplay( None )
+		self.root = self.X.XDefaultRootWindow( self.disp )
+		self.size = size
+		self.windows = []
+		w, h = size
+		for i in range( count ):
+			x, y = (i % 2) * (w + 20), (i // 2) * (h + 20)
+			win = self.X.XCreateSimpleWindow( self.disp, self.root,
+				x, y, w, h, 0, 0, 0 )
+			self.X.XStoreName( self.disp, win,
+				c_char_p( ("bench %d - Sublime Text" % i).encode() ) )
+			self._set( win, "_NET_WM_PID", XA_CARDINAL, [os.getpid()] )
+			self.X.XMapWindow( self.disp, win )
+			self.windows.append( (win, (x, y, w, h)) )
+
+		# Act as window manager: publish the client list:
+		self._set( self.root, "_NET_CLIENT_LIST", XA_WINDOW,
+			[win for win, _ in self.windows] )
+		self.X.XSync( self.disp, 0 )
+
+	def _set( self, win, prop, kind, values ):
+		atom = self.X.XInternAtom( self.disp, c_char_p( prop.encode() ), 0 )
+		data = (c_ulong * len( values ))( *values )
+		self.X.XChangeProperty( self.disp, win, atom, kind, 32,
+			PropModeReplace, data, len( values ) )
+
+	# Root coordinates of a point local to stand-in i:
+	def at( self, i, x, y ):
+		wx, wy, _, _ = self.windows[i][1]
+		return (wx + x, wy + y)
+
+	# A root point outside of every stand-in:
+	def outside( self ):
+		return (self.size[0] * 2 + 100, 10)
+
+	def close( self ): self.X.XCloseDisplay( self.disp )
+
+# Pointer injection via XTest on a connection of its own:
+class Pointer( object ):
+	def __init__( self, X11 ):
+		path = find_library( "Xtst" )
+		if not path: sys.exit( "Can't find libXtst!" )
+		self.Xtst = CDLL( path )
+		self.X = X11.X11
+		self.disp = self.X.XOpenDisplay( None )
+
+	def move( self, x, y ):
+		self.Xtst.XTestFakeMotionEvent( self.disp, -1, x, y, 0 )
+		self.X.XFlush( self.disp )
+
+	def close( self ): self.X.XCloseDisplay( self.disp )
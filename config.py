@@ -0,0 +1,72 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# An immutable snapshot of the plugin's settings: plain attributes named
+# as the keys of sublime-autohide-sidebar.sublime-settings. Rebuilt when
+# the settings change, per project overrides are layered on top.
+#
+
+KEYS = ('hide_show_padding_x', 'show_delay_ms', 'hide_delay_ms',
+	'dwell_velocity', 'batch_events', 'max_event_rate', 'tracking_backend',
+	'poll_min_interval_ms', 'poll_max_interval_ms', 'poll_near_px',
+	'poll_far_px', 'edge_sensor_width', 'coordinates_backend',
+	'on_load_quiet_ms', 'dispatch_queue_size', 'stats_enabled',
+	'stats_json_path', 'stats_interval_s', 'record_trace_path',
+	'record_buffer_events')
+
+# The per window keys, re-read per window: the only ones a project may
+# override (see the settings file):
+WINDOW_KEYS = ('hide_show_padding_x', 'show_delay_ms', 'hide_delay_ms',
+	'dwell_velocity')
+
+class Config( object ):
+	__slots__ = KEYS
+
+	def __init__( self, values ):
+		for k in KEYS: object.__setattr__( self, k, values.get( k ) )
+
+	def __setattr__( self, k, v ):
+		raise AttributeError( "Config is immutable: " + k )
+
+	# Snapshot of a sublime Settings object:
+	def load( settings ):
+		return Config( {k: settings.get( k ) for k in KEYS} )
+
+	# Returns a Config with the per window keys of dict overrides applied,
+	# warns about any other key:
+	def override( self, overrides ):
+		if not overrides: return self
+		ignored = sorted( k for k in overrides if k not in WINDOW_KEYS )
+		if ignored:
+			print( "autohide_sidebar: only per window options can be "
+				   "overridden per project, ignoring: " + ", ".join( ignored ) )
+		values = {k: getattr( self, k ) for k in KEYS}
+		values.update( (k, v) for k, v in overrides.items()
+					   if k in WINDOW_KEYS )
+		return Config( values )
+
+# Overrides in the project of window: "settings": {"autohide_sidebar": {...}}:
+def project_overrides( window ):
+	data = window.project_data() or {}
+	return (data.get( 'settings' ) or {}).get( 'autohide_sidebar' )
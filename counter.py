@@ -1,38 +0,0 @@
-"""
-Autohide Sidebar
-or: sublime-autohide-sidebar
-
-A Sublime Text plugin that autohides the sidebar and shows
-it when the mouse hovers the edge of the editors window.
-
-Copyright (C) 2015, Mazdak Farrokhzad
-
-This program is free software: you can redistribute it and/or modify
-it under the terms of the GNU General Public License as published by
-the Free Software Foundation, either version 2 of the License, or
-(at your option) any later version.
-
-This program is distributed in the hope that it will be useful,
-but WITHOUT ANY WARRANTY; without even the implied warranty of
-MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-GNU General Public License for more details.
-
-You should have received a copy of the GNU General Public License
-along with this program.  If not, see <http://www.gnu.org/licenses/>.
-"""
-
-from threading import Lock
-
-# An atomic counter:
-class Counter():
-	def __init__( self, start = 0 ):
-		self.lock = Lock()
-		self.counter = start
-
-	def inc( self ): return self._do(  1 )
-	def dec( self ): return self._do( -1 )
-
-	def _do( self, m ):
-		with self.lock:
-			self.counter += m
-			return self.counter
\ No newline at end of file
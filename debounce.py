@@ -0,0 +1,63 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from threading import Lock
+
+# Per key debouncer: fn( *args ) runs once after a quiet period in which
+# poke( key, ... ) was not called again. Each key has at most one pending
+# timer, tagged with the generation it was armed for; a storm of pokes thus
+# costs O(1) scheduled callbacks per key.
+class Debouncer():
+	# schedule( callback, delay_ms ), e.g: sublime.set_timeout_async:
+	def __init__( self, schedule, fn ):
+		self.lock = Lock()
+		self.schedule = schedule
+		self.fn = fn
+		self.generations = {}
+		self.pending = {}
+		self.args = {}
+
+	def poke( self, key, quiet, *args ):
+		with self.lock:
+			gen = self.generations.get( key, 0 ) + 1
+			self.generations[key] = gen
+			self.args[key] = args
+			if key in self.pending: return
+			self.pending[key] = gen
+		self._arm( key, quiet )
+
+	def _arm( self, key, quiet ):
+		self.schedule( lambda: self._fire( key, quiet ), quiet )
+
+	def _fire( self, key, quiet ):
+		with self.lock:
+			gen = self.generations[key]
+			rearm = self.pending[key] != gen
+			if rearm: self.pending[key] = gen
+			else:
+				del self.pending[key], self.generations[key]
+				args = self.args.pop( key )
+
+		# Poked meanwhile: wait another quiet period.
+		if rearm: self._arm( key, quiet )
+		else: self.fn( *args )
@@ -0,0 +1,94 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from collections import deque
+from threading import Lock
+
+# A bounded single producer queue, drained in batches on another thread:
+# push() is called by the producer (the tracker thread) and schedules one
+# drain per burst with schedule( callback, delay_ms ), e.g: set_timeout,
+# handle( items ) then runs on that thread.
+# When full, items are dropped & each passed to on_drop( item ): all but
+# the latest item per key( item ), else the oldest item. Items keyed None
+# (e.g. leaves) are never dropped, the queue then grows past capacity.
+# Without key, the oldest item is dropped. Shedding & draining exclude
+# each other, pushing & draining alone are atomic deque operations.
+class Dispatcher():
+	def __init__( self, schedule, handle, capacity = 1024, on_drop = None,
+				  key = None ):
+		self.queue = deque()
+		self.capacity = capacity
+		self.schedule = schedule
+		self.handle = handle
+		self.on_drop = on_drop
+		self.key = key
+		self.lock = Lock()
+		self.scheduled = False
+
+	def push( self, item ):
+		q = self.queue
+		if len( q ) >= self.capacity:
+			with self.lock: self._shed()
+		q.append( item )
+		if not self.scheduled:
+			self.scheduled = True
+			self.schedule( self.drain, 0 )
+
+	# Makes room, see above. Only runs when the consumer falls behind,
+	# collapsing per key frees many slots in one pass:
+	def _shed( self ):
+		q = self.queue
+		key = self.key
+		if key is None: return self._drop( [q.popleft()] )
+
+		seen = set()
+		kept, dropped = [], []
+		for item in reversed( q ):
+			k = key( item )
+			if k is not None and k in seen: dropped.append( item )
+			else:
+				kept.append( item )
+				if k is not None: seen.add( k )
+		if dropped:
+			q.clear()
+			q.extend( reversed( kept ) )
+			return self._drop( reversed( dropped ) )
+
+		# Each item is the latest of its key: drop the oldest keyed one:
+		for i, item in enumerate( q ):
+			if key( item ) is not None:
+				del q[i]
+				return self._drop( [item] )
+
+	def _drop( self, items ):
+		if self.on_drop:
+			for item in items: self.on_drop( item )
+
+	# Items pushed while draining are either handled now or by a new drain:
+	def drain( self ):
+		self.scheduled = False
+		q = self.queue
+		items = []
+		with self.lock:
+			while q: items.append( q.popleft() )
+		if items: self.handle( items )
@@ -21,12 +21,18 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from .base import DriverMeta, MoveEventMeta, find_key, map_coordinates
+from .base import DriverMeta, MoveEventMeta, map_coordinates
 
 # Imports:
-from threading import Lock
-from contextlib import contextmanager
-from os import popen
+from threading import Lock, current_thread, local
+from time import monotonic, perf_counter
+from select import select
+from heapq import heappush, heappop
+from collections import deque
+from os import pipe, read, write, close, O_NONBLOCK
+from fcntl import fcntl, F_GETFL, F_SETFL
+from os import readlink
+from os.path import basename
 from ctypes import *
 from ctypes.util import find_library
 
@@ -60,13 +66,6 @@ class XAnyEvent( Structure ):
 		('window', Window)
 	]
 
-class XClientMessageEvent( XAnyEvent ):
-	_fields_ = [
-		('message_type', Atom),
-		('format', c_int),
-		('data', (c_char * 20))
-	]
-
 XEventCommon = [
 	('root', Window),
 	('subwindow', Window),
@@ -90,49 +89,191 @@ class XCrossingEvent( XAnyEvent ):
 		('state', c_uint),
 	]
 
+# XAnyEvent.window is the "event" window here, target is "window":
+class XConfigureEvent( XAnyEvent ):
+	_fields_ = [
+		('target', Window),
+		('x', c_int), ('y', c_int),
+		('width', c_int), ('height', c_int),
+		('border_width', c_int),
+		('above', Window),
+		('override_redirect', Bool)
+	]
+
+class XReparentEvent( XAnyEvent ):
+	_fields_ = [
+		('target', Window),
+		('parent', Window),
+		('x', c_int), ('y', c_int),
+		('override_redirect', Bool)
+	]
+
+# Generic events share the first fields of XAnyEvent, but not window:
+class XPropertyEvent( XAnyEvent ):
+	_fields_ = [
+		('atom', Atom),
+		('time', Time),
+		('state', c_int)
+	]
+
+class XFocusChangeEvent( XAnyEvent ):
+	_fields_ = [
+		('mode', c_int),
+		('detail', c_int)
+	]
+
+class XGenericEventCookie( Structure ):
+	_fields_ = [
+		('type', c_int),
+		('serial', c_ulong),
+		('send_event', Bool),
+		('display', DisplayPtr ),
+		('extension', c_int),
+		('evtype', c_int),
+		('cookie', c_uint),
+		('data', c_void_p)
+	]
+
 class XEvent( Union ):
 	_fields_ = [
 		('type', c_int),
 		('xany', XAnyEvent),
 		('xmotion', XMotionEvent),
 		('xcross', XCrossingEvent),
-		('xcm', XClientMessageEvent),
+		('xfocus', XFocusChangeEvent),
+		('xconfigure', XConfigureEvent),
+		('xreparent', XReparentEvent),
+		('xproperty', XPropertyEvent),
+		('xcookie', XGenericEventCookie),
 		('pad', c_long * 24),
 	]
 
-EventPredicate = CFUNCTYPE( Bool, DisplayPtr, POINTER( XEvent ), XPointer )
 X11.XOpenDisplay.restype = DisplayPtr
 
 # Constants: XWindow._property:
 MAX_PROPERTY_VALUE_LEN = int( 4096 / 4 )
-BYTE_LONG = int( 32 / sizeof( c_long ) )
 XA_CARDINAL = 6
 XA_WINDOW = 33
 XA_STRING = 31
 Success = 0
 
+# Constants: Event loop, in seconds:
+STOP_TIMEOUT = 0.5
+QueuedAlready = 0
+
+# Events drained into the tracker's preallocated XEvents per batch, at most:
+BATCH_MAX = 256
+
 # Constants: Motion & Leave:
 MotionNotify = 6
+EnterNotify = 7
 LeaveNotify	= 8
-ClientMessage = 33
-NotifyList = [MotionNotify, LeaveNotify]
+FocusIn = 9
+FocusOut = 10
+UnmapNotify = 18
+ReparentNotify = 21
+ConfigureNotify = 22
+PropertyNotify = 28
+GenericEvent = 35
+NotifyInferior = 2
+NotifyList = [MotionNotify, EnterNotify, LeaveNotify, FocusIn, FocusOut]
+FocusList = [FocusIn, FocusOut]
+StructureList = [ConfigureNotify, ReparentNotify, PropertyNotify, UnmapNotify]
 NoEventMask = 0
-PointerMotionMask = (1 << 6)
+EnterWindowMask = (1 << 4)
 LeaveWindowMask	= (1 << 5)
-SubstructureNotifyMask = (1 << 19) 
-EventMask = PointerMotionMask | LeaveWindowMask | SubstructureNotifyMask
+PointerMotionMask = (1 << 6)
+StructureNotifyMask = (1 << 17)
+FocusChangeMask = (1 << 21)
+PropertyChangeMask = (1 << 22)
+# Clients that are neither hovered nor focused only report crossing, focus
+# & structure changes, motion is selected while hovered or focused:
+IdleEventMask = EnterWindowMask | LeaveWindowMask | FocusChangeMask |\
+				StructureNotifyMask
+EventMask = IdleEventMask | PointerMotionMask
+# Backends observing the pointer elsewhere only need structure events:
+StructureEventMask = StructureNotifyMask
+# With edge sensors, clients only report leaving & structure changes:
+SensorClientMask = LeaveWindowMask | StructureNotifyMask
+
+# Atoms used by the driver, interned in one batch by Driver.__init__:
+ATOM_NAMES = ["_NET_CLIENT_LIST", "_WIN_CLIENT_LIST", "_NET_WM_PID",
+			  "WM_NAME", "_NET_WM_NAME", "UTF8_STRING"]
 
 # Returns atom identifier associated with specified prop string:
+X11.XInternAtom.restype = Atom
 def intern_atom( disp, prop ):
+	round_trip()
 	return X11.XInternAtom( disp, c_char_p( prop.encode() ), 0 )
 
-@contextmanager
-def x_lock( disp ):
-	try:
-		X11.XLockDisplay( disp )
-		yield 
-	finally:
-		X11.XUnlockDisplay( disp )
+# Per display table of interned atoms, missing names are interned lazily:
+class AtomTable( object ):
+	def __init__( self, disp ):
+		self.disp = disp
+		self.atoms = {}
+
+	# Interns names with a single XInternAtoms round trip:
+	def preload( self, names ):
+		n = len( names )
+		ret = (Atom * n)()
+		round_trip()
+		X11.XInternAtoms( self.disp,
+			(c_char_p * n)( *[name.encode() for name in names] ), n, 0, ret )
+		self.atoms.update( zip( names, ret ) )
+
+	def __getitem__( self, name ):
+		atom = self.atoms.get( name )
+		if atom is None:
+			atom = intern_atom( self.disp, name )
+			self.atoms[name] = atom
+		return atom
+
+# Returns the atom table of disp, keyed by its address: forget_atoms()
+# before closing disp, a later display may reuse the address:
+atom_tables = {}
+def atoms( disp ):
+	key = addressof( disp.contents )
+	table = atom_tables.get( key )
+	if table is None:
+		table = atom_tables[key] = AtomTable( disp )
+	return table
+
+def forget_atoms( disp ): atom_tables.pop( addressof( disp.contents ), None )
+
+# Counts blocking requests (round trips) made to the X server:
+round_trips = 0
+def round_trip():
+	global round_trips
+	round_trips += 1
+
+# Out parameters of XGetGeometry, XTranslateCoordinates & XQueryPointer,
+# allocated once per thread & reused, as are their byref:s:
+class OutParams( local ):
+	def __init__( self ):
+		self.root, self.child = Window(), Window()
+		self.ints = [c_int() for _ in range( 4 )]
+		self.uints = [c_uint() for _ in range( 5 )]
+		self.root_ref, self.child_ref = byref( self.root ), byref( self.child )
+		self.int_refs = [byref( e ) for e in self.ints]
+		self.uint_refs = [byref( e ) for e in self.uints]
+
+out_params = OutParams()
+
+# XLockDisplay as a context manager, reusable: hot paths keep one around:
+class XLock( object ):
+	__slots__ = ('disp',)
+
+	def __init__( self, disp ): self.disp = disp
+	def __enter__( self ): X11.XLockDisplay( self.disp )
+	def __exit__( self, type, value, traceback ): X11.XUnlockDisplay( self.disp )
+
+def x_lock( disp ): return XLock( disp )
+
+# Property readers, see XWindow._property:
+def read_bytes( prop, format, n ): return string_at( prop, n * format // 8 )
+
+# Format 32 items are longs in Xlib's buffer:
+def read_longs( prop, format, n ): return cast( prop, POINTER( c_ulong ) )[:n]
 
 # XWindow: a wrapper around X11 Windows:
 class XWindow( object ):
@@ -152,17 +293,19 @@ class XWindow( object ):
 		with x_lock( disp ): 
 			return XWindow( disp, X11.XRootWindow( disp, 0 ) )
 
-	# Retrieves a property of X11 window of prop_name:
-	def _property( self, xa_prop_type, prop_name, mbuf = None ):
-		xa_prop_name = Atom()
+	# Retrieves a property of X11 window of prop_name, read by
+	# read( ret_prop, format, nitems ) straight from Xlib's buffer,
+	# by default as bytes:
+	def _property( self, xa_prop_type, prop_name, read = None ):
 		xa_ret_type = Atom()
 		ret_format = c_int()
 		ret_nitems = c_ulong()
 		ret_prop = POINTER( c_ubyte )()
-		xa_prop_name = intern_atom( self.disp, prop_name )
+		xa_prop_name = atoms( self.disp )[prop_name]
 
 		# MAX_PROPERTY_VALUE_LEN / 4 explanation (XGetWindowProperty manpage):
 		# long_length = Length in 32-bit multiples of the data to be retrieved.
+		round_trip()
 		s = X11.XGetWindowProperty( self.disp, self.win, xa_prop_name, 0,
 				MAX_PROPERTY_VALUE_LEN, 0, xa_prop_type,
 				byref( xa_ret_type ), byref( ret_format ),
@@ -175,24 +318,19 @@ class XWindow( object ):
 			X11.XFree( ret_prop )
 			return
 
-		if mbuf:
-			(buf, byte_size) = mbuf( ret_format.value, ret_nitems.value )
-		else:
-			byte_size = ret_nitems.value * int( ret_format.value / 8 )
-			buf = create_string_buffer( byte_size )
-
-		memmove( buf, ret_prop, byte_size )
-		X11.XFree( ret_prop )
-		return buf
+		try:
+			read = read or read_bytes
+			return read( ret_prop, ret_format.value, ret_nitems.value )
+		finally: X11.XFree( ret_prop )
 
 	# Get top level X11 windows:
 	def client_list( self ):
 		with x_lock( self.disp ):
-			mbuf = lambda f, n: ((Window * n)(), int( f / BYTE_LONG ) * n)
-			r = self._property( XA_WINDOW, "_NET_CLIENT_LIST", mbuf )
-			if not r:
-				r = self._property( XA_CARDINAL, "_WIN_CLIENT_LIST", mbuf )
-				if not r:
+			r = self._property( XA_WINDOW, "_NET_CLIENT_LIST", read_longs )
+			if r is None:
+				r = self._property( XA_CARDINAL, "_WIN_CLIENT_LIST",
+									read_longs )
+				if r is None:
 					return print( "Cannot get client list properties.\n"\
 								  "(_NET_CLIENT_LIST or _WIN_CLIENT_LIST)" )
 			return [XWindow( self.disp, w ) for w in r]
@@ -200,19 +338,20 @@ class XWindow( object ):
 	# Retrieves PID of a X11 window if possible:
 	def pid( self ):
 		with x_lock( self.disp ):
-			mbuf = lambda f, n: (pointer( c_ulong() ), int( f / BYTE_LONG ) * n)
-			r = self._property( XA_CARDINAL, "_NET_WM_PID", mbuf )
+			r = self._property( XA_CARDINAL, "_NET_WM_PID", read_longs )
 			if not r: return print( "Can't get PID of window: ", self.win )
-			return r.contents.value
+			return r[0]
 
-	# Retrieves title of X11 window if possible:
+	# Retrieves title of X11 window if possible, _NET_WM_NAME is UTF-8,
+	# WM_NAME (as STRING) Latin-1:
 	def title( self ):
-		with x_lock( self.disp ): 
+		with x_lock( self.disp ):
+			r = self._property( atoms( self.disp )["UTF8_STRING"],
+								"_NET_WM_NAME" )
+			if r: return r.decode( 'utf-8', errors = 'replace' )
 			r = self._property( XA_STRING, "WM_NAME" )
-			if not r:
-				r = self._property( XA_CARDINAL, "_NET_WM_NAME" )
-				if not r: return print( "Can't get title of window: ", win )
-			return r[:].decode()
+			if r: return r.decode( 'latin-1' )
+		print( "Can't get title of window: ", self.win )
 
 	# Allows events specified by mask to happen for window:
 	def select_input( self, mask ):
@@ -221,132 +360,595 @@ class XWindow( object ):
 
 	# Returns a tuple ((x-pos, y-pos, width, height), root_window) of window:
 	def geom( self ):
-		root = Window()
-		rect = [c_int(), c_int(), c_uint(), c_uint()]
-		refs = [byref( e ) for e in rect]
+		o = out_params
+		x, y = o.int_refs[:2]
+		w, h, border, depth = o.uint_refs[:4]
 
 		# Get geometry and roof of window, ignore rest:
+		round_trip()
 		with x_lock( self.disp ):
-			X11.XGetGeometry( self.disp, self.win, byref( root ),
-				refs[0], refs[1], refs[2], refs[3],
-				byref( c_uint() ), byref( c_uint() ) )
+			X11.XGetGeometry( self.disp, self.win, o.root_ref,
+				x, y, w, h, border, depth )
 
-		# Translate if needed (not same window as root) to root coordinates:
+		# Translate if needed (not same window as root) origin to root coordinates:
+		root = o.root.value
 		if self.win != root:
+			round_trip()
 			with x_lock( self.disp ):
-				X11.XTranslateCoordinates( self.disp, self.win, root,
-					rect[0], rect[1], refs[0], refs[1], byref( Window() ) )
+				X11.XTranslateCoordinates( self.disp, self.win, o.root,
+					0, 0, x, y, o.child_ref )
 
 		# Return values & make a new window wrapper:
-		return (tuple( e.value for e in rect ), XWindow( self.disp, root ))
+		ints, uints = o.ints, o.uints
+		return ((ints[0].value, ints[1].value, uints[0].value, uints[1].value),
+				XWindow( self.disp, root ))
 
 	# Returns the position of pointer relative to window:
 	def pointer( self ):
-		w1, w2 = [byref( Window() ) for _ in range( 2 )]
-		xys = [c_int() for _ in range( 4 )]
-		refs = [byref( e ) for e in xys]
-
+		o = out_params
+		refs = o.int_refs
+		round_trip()
+		with x_lock( self.disp ):
+			X11.XQueryPointer( self.disp, self.win, o.root_ref, o.child_ref,
+				refs[0], refs[1], refs[2], refs[3], o.uint_refs[4] )
+		ints = o.ints
+		return (ints[0].value, ints[1].value, ints[2].value, ints[3].value)
+
+	# Returns (x-root, y-root, child) where child is the child window of
+	# this window that contains the pointer, or 0 if there is none:
+	def pointer_child( self ):
+		o = out_params
+		refs = o.int_refs
+		round_trip()
 		with x_lock( self.disp ):
-			X11.XQueryPointer( self.disp, self.win, w1, w2,
-				refs[0], refs[1], refs[2], refs[3], byref( c_ulong() ) )
+			X11.XQueryPointer( self.disp, self.win, o.root_ref, o.child_ref,
+				refs[0], refs[1], refs[2], refs[3], o.uint_refs[4] )
+		return (o.ints[0].value, o.ints[1].value, o.child.value)
+
+	# Returns the top level ancestor (child of root, usually the WM frame):
+	def toplevel( self ):
+		win = self.win
+		root, parent = Window(), Window()
+		children, n = POINTER( Window )(), c_uint()
+		while True:
+			round_trip()
+			with x_lock( self.disp ):
+				if not X11.XQueryTree( self.disp, win, byref( root ),
+						byref( parent ), byref( children ), byref( n ) ):
+					return win
+				if children: X11.XFree( children )
+			if parent.value in (0, root.value): return win
+			win = parent.value
+
+# Returns the name of the process with pid, via /proc, if possible:
+def process_name( pid ):
+	try:
+		with open( "/proc/%d/comm" % pid ) as f: return f.read().strip()
+	except (OSError, IOError): pass
+	try: return basename( readlink( "/proc/%d/exe" % pid ) )
+	except (OSError, IOError): return
 
-		return tuple( e.value for e in xys )
+# Checks if process of pid is sublime text:
+def is_sublime_pid( pid ):
+	name = process_name( pid )
+	return bool( name ) and "sublime_text" in name
 
 # Checks if window is a sublime text window:
-def is_sublime( win ):
+def is_sublime( win, pid_check = is_sublime_pid ):
 	pid = win.pid()
 	if not pid: return False
-	r = popen( "ps -p %s -c -o command" % pid ).read().split()
-	if len( r ) and "sublime_text" in r[-1]: return True
+	if pid_check( pid ): return True
 	# Fallback approach:
 	title = win.title()
 	return title.endswith( ' - Sublime Text' ) if title else False
 
+# Caches is_sublime verdicts per X window and per PID,
+# so that foreign clients are only ever classified once:
+class Classifier( object ):
+	def __init__( self ):
+		self.windows = {}
+		self.pids = {}
+
+	def __call__( self, win ):
+		v = self.windows.get( win.win )
+		if v is None:
+			v = is_sublime( win, self._pid )
+			self.windows[win.win] = v
+		return v
+
+	def _pid( self, pid ):
+		v = self.pids.get( pid )
+		if v is None:
+			v = is_sublime_pid( pid )
+			self.pids[pid] = v
+		return v
+
+	# Forgets a window, e.g: when it has been destroyed:
+	def forget( self, handle ): self.windows.pop( handle, None )
+
 """
 Move event logic:
 """
 
 class MoveEvent( MoveEventMeta ):
-	def __init__( self, driver, move, leave ):
-		# For some reason X11 can't work with daemon threads:
-		super().__init__( driver, move, leave, False )
+	def __init__( self, driver, move, leave, resize = None, **opts ):
+		super().__init__( driver, move, leave, resize, True, **opts )
+		self.timers = []
+		self.timers_lock = Lock()
+		self.timer_seq = 0
+		self.wake_r, self.wake_w = pipe()
+		for fd in (self.wake_r, self.wake_w):
+			fcntl( fd, F_SETFL, fcntl( fd, F_GETFL ) | O_NONBLOCK )
+		driver.wake = self._wake
+
+		# Whether run() has returned, & whether it must then close the
+		# display itself as _stopx gave up joining, see _close():
+		self.exit_lock = Lock()
+		self.exited = False
+		self.orphaned = False
+
+		# Reused XEvents events are drained into, with their byref & the
+		# views of the union members the hot path reads (ctypes creates a
+		# new view on each access), & the batch of one (see _drain):
+		self.pool = (XEvent * BATCH_MAX)()
+		self.events = [self.pool[i] for i in range( BATCH_MAX )]
+		for e in self.events:
+			e.ref = byref( e )
+			e.any, e.motion, e.cross = e.xany, e.xmotion, e.xcross
+		self.single = self.events[:1]
+
+	# Whether or not the tracker is interested in event e:
+	def _accept( self, e ):
+		inl = e.type in NotifyList and not e.any.send_event
+		return inl or e.type in StructureList
+
+	# Runs fn in the tracker thread after delay seconds:
+	def call_later( self, delay, fn ):
+		with self.timers_lock:
+			self.timer_seq += 1
+			heappush( self.timers, (monotonic() + delay, self.timer_seq, fn) )
+		self._wake()
+
+	# Runs due timers, returns seconds until the next one, None if none:
+	def _run_timers( self ):
+		while True:
+			with self.timers_lock:
+				if not self.timers: return
+				wait = self.timers[0][0] - monotonic()
+				if wait > 0: return wait
+				fn = heappop( self.timers )[2]
+			fn()
+
+	def _wake( self ):
+		try: write( self.wake_w, b"." )
+		except OSError: pass # Pipe full => a wakeup is pending anyway.
+
+	# Blocks until one of fds is readable or timeout, swallows wakeups:
+	def _wait( self, fds, timeout ):
+		if self.wake_r in select( fds, [], [], timeout )[0]:
+			try:
+				while read( self.wake_r, 64 ): pass
+			except OSError: pass
+
+	# Moves pending events of interest out of the X queue, into the
+	# pooled XEvents, valid until the next call. The hot path locks the
+	# display explicitly: a with statement allocates its bound __exit__:
+	def _drain( self, disp ):
+		events = self.events
+		n = 0
+		X11.XLockDisplay( disp )
+		try:
+			while n < BATCH_MAX and X11.XPending( disp ):
+				e = events[n]
+				X11.XNextEvent( disp, e.ref )
+				if self._accept( e ):
+					n += 1
+					if not self.batch: break
+		finally: X11.XUnlockDisplay( disp )
+		return self.single if n == 1 else events[:n]
 
 	def run( self ):
-		def check_client_message( e ):
-			return e.data.value.encode() == "sb-autohide-sidebar"
-
-		# Using predicate to avoid copying events of no interest:
-		def event_predicate( d, event, a ):
-			e = event.contents
-			inl = e.type in NotifyList and not e.xany.send_event
-			cm = e.type == ClientMessage and check_client_message( e.xcm )
-			return inl or cm
-		pred = EventPredicate( event_predicate )
-
-		while self.alive:
-			# Block, waiting for an event:
-			e = XEvent()
-			ref = byref( e )
-			X11.XIfEvent( self.driver.disp, ref, pred, None )
-
-			if e.type == ClientMessage: break
-
-			# Route event &
-			# Put event back, we are just passively snooping:
-			mask, fn = ((PointerMotionMask, self._move)
-						if e.type == MotionNotify
-						else (LeaveWindowMask, self._leave))
-			fn( e )
-
-			with x_lock( self.driver.disp ):
-				X11.XSendEvent( self.driver.disp, e.xany.window, 0, mask, ref )
-
-		X11.XCloseDisplay( self.driver.disp )
-
-	def _event_id( self, event ):
-		return self.driver.win_map[XWindow( self.driver.disp, event.window )]
-
-	def _move( self, event ):
-		e = event.xmotion
-		self.move( self._event_id( e ), e.x, e.y )
-
-	def _leave( self, event ):
-		self.leave( self._event_id( event.xcross ) )
+		disp = self.driver.disp
+		fds = [X11.XConnectionNumber( disp ), self.wake_r]
+		interval = 1.0 / self.max_rate if self.batch and self.max_rate else 0
+		ready = 0
+		try:
+			while self.alive:
+				timeout = self._run_timers()
+
+				# Throttled: let events pile up (and be coalesced) in X's queue:
+				now = monotonic()
+				if now < ready:
+					self._wait( fds[1:], ready - now if timeout is None
+										 else min( timeout, ready - now ) )
+					continue
+
+				batch = self._drain( disp )
+				if batch:
+					self._dispatch( batch )
+					if interval: ready = now + interval
+				else:
+					# Events Xlib queued in other threads wake us, see handoff:
+					self._wait( fds, timeout )
+		finally:
+			with self.exit_lock:
+				self.exited = True
+				if self.orphaned: self._close()
+
+	# Closes the display & wakeup pipe, once the loop no longer uses them:
+	def _close( self ):
+		self.driver.close()
+		for fd in (self.wake_r, self.wake_w): close( fd )
+
+	# Handles a structure event: Configure-, Reparent-, Property- or
+	# UnmapNotify:
+	def _structure( self, e ):
+		if e.type == UnmapNotify:
+			return self.driver.activity( e.xany.window, inside = False,
+										 focused = False )
+		if e.type == ReparentNotify:
+			return self.driver.reparent( e.xreparent )
+		if e.type == PropertyNotify:
+			return self.driver.property( e.xproperty )
+		_id = self.driver.configure( e.xconfigure )
+		if _id is not None and self.resize: self.resize( _id )
+
+	# Handles a batch of events.
+	# MotionNotify:s (& EnterNotify:s) are coalesced per window to the
+	# latest position, a LeaveNotify ends a run so that motion => leave
+	# order is kept. A batch of one has nothing to coalesce: it is routed
+	# without the containers, see bench/alloc.py:
+	def _dispatch( self, batch ):
+		sensors = self.driver.sensors
+		if len( batch ) == 1:
+			e = batch[0]
+			handle = e.any.window
+			if self._pointer_event( e, handle, sensors ):
+				if self.stats and not (sensors and sensors.origin( handle )):
+					self._count( {handle: 1} )
+				self._timed_op( e, handle, sensors )
+			return
 
+		ops = []
+		moves = {}
+		received = {}
+		for e in batch:
+			handle = e.any.window
+			if not self._pointer_event( e, handle, sensors ): continue
+
+			# Edge sensor crossings are routed in order, as moves:
+			if sensors and sensors.origin( handle ):
+				ops.append( e )
+				continue
+
+			received[handle] = received.get( handle, 0 ) + 1
+			if e.type != LeaveNotify:
+				i = moves.get( handle )
+				if i is None:
+					moves[handle] = len( ops )
+					ops.append( e )
+				else: ops[i] = e
+			else:
+				moves.pop( handle, None )
+				ops.append( e )
+
+		if self.stats: self._count( received )
+		for e in ops: self._timed_op( e, e.any.window, sensors )
+
+	# Handles structure & focus events, and crossings into / out of a child
+	# of the window (no leaves). Crossings switch the window's mask.
+	# Returns whether e (of window handle) is to be routed as a move / leave:
+	def _pointer_event( self, e, handle, sensors ):
+		if e.type in StructureList:
+			self._structure( e )
+			return False
+
+		if e.type in FocusList:
+			if e.xfocus.detail != NotifyInferior:
+				self.driver.activity( handle, focused = e.type == FocusIn )
+			return False
+
+		if e.type != MotionNotify and not (sensors and sensors.origin( handle )):
+			if e.cross.detail == NotifyInferior: return False
+			self.driver.activity( handle, inside = e.type == EnterNotify )
+		return True
+
+	def _timed_op( self, e, handle, sensors ):
+		stats = self.stats
+		if not stats: return self._op( e, handle, sensors )
+		t0 = perf_counter()
+		stats.window( self._op( e, handle, sensors ) ).time( 'event', t0 )
+
+	# Routes event e of window handle (an EnterNotify is a move to where it
+	# entered) & Puts motion & leaves back, we are just passively snooping:
+	def _op( self, e, handle, sensors ):
+		origin = sensors.origin( handle ) if sensors else None
+		if origin: return self._sensor( e, origin[0], origin[1] )
+
+		if e.type == LeaveNotify:
+			mask = LeaveWindowMask
+			_id = self._leave( e, handle )
+		else:
+			mask = PointerMotionMask
+			_id = self._move( e, handle )
+
+		if e.type != EnterNotify:
+			disp = self.driver.disp
+			X11.XLockDisplay( disp )
+			try: X11.XSendEvent( disp, handle, 0, mask, e.ref )
+			finally: X11.XUnlockDisplay( disp )
+		return _id
+
+	# Stats: events received & coalesced per window:
+	def _count( self, received ):
+		for handle, n in received.items():
+			ws = self.stats.window( self.driver.win_map.id( handle ) )
+			ws.events += n
+			ws.coalesced += n - 1 if n > 1 else 0
+
+	def _event_id( self, handle ):
+		if not self.stats: return self.driver.win_map.id( handle )
+		t0 = perf_counter()
+		_id = self.driver.win_map.id( handle )
+		ws = self.stats.window( _id )
+		ws.time( 'lookup', t0 )
+		if _id is None: ws.lookup_misses += 1
+		return _id
+
+	# XMotionEvent & XCrossingEvent share x & y:
+	def _move( self, event, handle ):
+		e = event.motion
+		_id = self._event_id( handle )
+		self.move( _id, e.x, e.y )
+		return _id
+
+	# Crossed an edge sensor at x in client: a move to where it crossed:
+	def _sensor( self, event, client, x ):
+		e = event.cross
+		_id = self.driver.win_map.id( client )
+		if _id is not None: self.move( _id, x + e.x, e.y )
+		return _id
+
+	def _leave( self, event, handle ):
+		_id = self._event_id( handle )
+		self.leave( _id )
+		return _id
+
+	# Closes the driver to sublime's callbacks still queued, wakes the loop
+	# up & joins it. The display is closed after it exited, by the loop
+	# itself if it did not within STOP_TIMEOUT:
 	def _stopx( self ):
-		with x_lock( self.driver.disp ):
-			win = next( iter( self.driver.win_map ) ).win
-			ev = XClientMessageEvent()
-			ev.type = ClientMessage
-			ev.display = self.driver.disp
-			ev.win = win
-			ev.format = 8
-			ev.data = create_string_buffer( b"sb-autohide-sidebar", 20 )
-			X11.XSendEvent( self.driver.disp, win, 0,
-				SubstructureNotifyMask, byref( ev ) )
-			X11.XFlush( self.driver.disp )
+		self.driver.closed = True
+		self._wake()
+		if current_thread() is not self: self.join( STOP_TIMEOUT )
+		with self.exit_lock:
+			if self.exited: self._close()
+			else: self.orphaned = True
 
 """
 Public API:
 """
 
+# Decorates public methods which wait for replies on sublime's thread:
+# events Xlib reads meanwhile are queued, they no longer make the
+# connection readable for the tracker's select(), which is woken up:
+def handoff( fn ):
+	def method( self, *args ):
+		try: return fn( self, *args )
+		finally:
+			if self.wake and not self.closed and\
+			   X11.XEventsQueued( self.disp, QueuedAlready ): self.wake()
+	return method
+
 class Driver( DriverMeta ):
-	def __init__( self ):
+	# coordinates: "xlib", or "xcb" to pipeline the requests of
+	# window_coordinates over an XCB connection (falls back to "xlib"):
+	def __init__( self, coordinates = 'xlib' ):
 		# Let's get things started in here:
 		# Create win_map, Initialize X11: Threading, get Display:
-		self.win_map = {}
+		super().__init__()
 		if not X11.XInitThreads(): quit( "X11 doesn't support multithreading." )
 		self.disp = X11.XOpenDisplay( None )
-
+		with x_lock( self.disp ): atoms( self.disp ).preload( ATOM_NAMES )
+
+		# Geometry cache: handle => (x, y, width, height) in root coordinates.
+		# Kept fresh by ConfigureNotify events received by the tracker:
+		self.geoms = {}
+		self.is_sublime = Classifier()
+
+		# Top level frame => bound client handle & back, and mask used for
+		# clients. Bound on sublime's thread, unbound / reparented on the
+		# tracker's: win_map & frames are only written under index_lock:
+		self.frames = {}
+		self.frame_of = {}
+		self.index_lock = Lock()
+		self.event_mask = IdleEventMask
+
+		# Clients hovered & focused, and the mask selected per client,
+		# see activity():
+		self.inside = set()
+		self.focused = set()
+		self.masks = {}
+
+		# Client => (show_x, hide_x, shown) of its wrapper, see set_edges(),
+		# and EdgeSensors if the "sensors" backend is used:
+		self.edges = {}
+		self.sensors = None
+
+		# Live set of top level clients, diffed on PropertyNotify of the
+		# client list; fresh: not yet classified, unbound: sublime, not bound.
+		self.clients = None
+		self.clients_lock = Lock()
+		self.fresh = deque()
+		self.unbound = []
+
+		self.root = XWindow.root( self.disp )
+		self.root.select_input( StructureNotifyMask | PropertyChangeMask )
+
+		# Set by the tracker on stop, the public API is then a no-op.
+		# wake: wakes the tracker's loop up, see handoff:
+		self.closed = False
+		self.wake = None
+
+		self.xcb = None
+		if coordinates == 'xcb':
+			from .xcb import XcbQueries
+			self.xcb = XcbQueries.connect( self.root.win )
+			if not self.xcb: print( "XCB not available, using Xlib." )
+
+	# Returns cached geometry of window handle, fetches it if needed:
+	def geometry( self, handle ):
+		g = self.geoms.get( handle )
+		if g is None:
+			g = XWindow( self.disp, handle ).geom()[0]
+			self.geoms[handle] = g
+		return g
+
+	# Updates the geometry cache from a ConfigureNotify event.
+	# Returns the sublime id of the window if its size changed:
+	def configure( self, e ):
+		handle = e.target
+		if handle not in self.geoms and handle not in self.win_map\
+		   and handle != self.root.win: return
+
+		# Synthetic events (sent by the WM) carry root coordinates,
+		# real ones are relative to the parent (frame): refetch lazily.
+		old = self.geoms.get( handle )
+		if e.send_event or handle == self.root.win:
+			self.geoms[handle] = (e.x, e.y, e.width, e.height)
+		else:
+			self.geoms.pop( handle, None )
+
+		if not old or old[2:] != (e.width, e.height):
+			return self.win_map.id( handle )
+
+	# The client list of root changed: diff it:
+	def property( self, e ):
+		a = atoms( self.disp )
+		if e.window == self.root.win and\
+		   e.atom in (a["_NET_CLIENT_LIST"], a["_WIN_CLIENT_LIST"]):
+			self.refresh_clients()
+
+	# Fetches the client list, records new clients and forgets gone ones:
+	def refresh_clients( self ):
+		top_windows = self.root.client_list()
+		if top_windows is None: return
+		handles = [w.win for w in top_windows]
+		with self.clients_lock:
+			known = self.clients
+			self.clients = set( handles )
+			if known is None:
+				self.fresh.extend( handles )
+				return
+			self.fresh.extend( h for h in handles if h not in known )
+			gone = known - self.clients
+		for handle in gone: self._gone( handle )
+
+	def _gone( self, handle ):
+		self.is_sublime.forget( handle )
+		self.geoms.pop( handle, None )
+		self.inside.discard( handle )
+		self.focused.discard( handle )
+		self.masks.pop( handle, None )
+		self.edges.pop( handle, None )
+		if self.sensors: self.sensors.forget( handle )
+		with self.index_lock:
+			self.win_map.unbind( handle )
+			self._set_frame( handle, None )
+
+	# Classifies fresh clients, returns sublime clients that are not bound.
+	# Clients are taken out of fresh one at a time: a client failing to
+	# classify does not drop the ones after it:
+	def _candidates( self ):
+		with self.clients_lock: clients = self.clients or ()
+		self.unbound = [h for h in self.unbound
+						if h in clients and h not in self.win_map]
+		while True:
+			with self.clients_lock:
+				if not self.fresh: break
+				h = self.fresh.popleft()
+			if h not in self.win_map and self._classify( h ):
+				self.unbound.append( h )
+		return self.unbound
+
+	def _classify( self, handle ):
+		try: return self.is_sublime( XWindow( self.disp, handle ) )
+		except Exception as e:
+			print( "Can't classify window", handle, e )
+			return False
+
+	# Rebinds frame of a client that was reparented (e.g. by a new WM):
+	def reparent( self, e ):
+		if e.target in self.win_map:
+			self.geoms.pop( e.target, None )
+			self._frame( e.target )
+
+	def _frame( self, handle ):
+		frame = XWindow( self.disp, handle ).toplevel()
+		with self.index_lock:
+			if handle in self.win_map: self._set_frame( handle, frame )
+
+	# Replaces the frame of handle (None: forget it), hold index_lock:
+	def _set_frame( self, handle, frame ):
+		old = self.frame_of.pop( handle, None )
+		if old is not None: self.frames.pop( old, None )
+		if frame is not None:
+			self.frames[frame] = handle
+			self.frame_of[handle] = frame
+
+	# Changes the event mask used for all bound clients:
+	def select_input( self, mask ):
+		self.event_mask = mask
+		self.masks.clear()
+		for handle in self.win_map:
+			XWindow( self.disp, handle ).select_input( mask )
+
+	# Records whether client handle is hovered / focused (None: unchanged),
+	# selects motion only while it is either. Backends which selected a
+	# fixed mask (see select_input) are left alone:
+	def activity( self, handle, inside = None, focused = None ):
+		if handle not in self.win_map: return
+		if inside is not None:
+			(self.inside.add if inside else self.inside.discard)( handle )
+		if focused is not None:
+			(self.focused.add if focused else self.focused.discard)( handle )
+		if self.event_mask != IdleEventMask: return
+
+		active = handle in self.inside or handle in self.focused
+		mask = EventMask if active else IdleEventMask
+		if self.masks.get( handle, IdleEventMask ) != mask:
+			self.masks[handle] = mask
+			XWindow( self.disp, handle ).select_input( mask )
+
+	# Closes the display, see MoveEvent._stopx:
+	def close( self ):
+		self.closed = True
+		forget_atoms( self.disp )
+		X11.XCloseDisplay( self.disp )
+		if self.xcb: self.xcb.close()
+
+	@handoff
 	def window_coordinates( self, _id ):
-		# Fetch window or quit if not available:
-		win = find_key( self.win_map, _id )
-		if not win: return
+		if self.closed: return
 
-		# Get geometrics & pointer:
-		(wx, wy, ww, wh), root = win.geom()
-		(rx, ry, _, _), _ = root.geom()
-		cx, cy, _, _ = root.pointer()
+		# Fetch window or quit if not available:
+		handle = self.win_map.handle( _id )
+		if not handle: return
+
+		# Get geometrics & pointer, fresh in one round trip with XCB:
+		r = None
+		if self.xcb:
+			round_trip()
+			r = self.xcb.window_and_pointer( handle )
+			if not r and not self._xcb_lost(): return
+		if r:
+			(wx, wy, ww, wh), (cx, cy) = r
+			self.geoms[handle] = (wx, wy, ww, wh)
+			rx = ry = 0
+		else:
+			wx, wy, ww, wh = self.geometry( handle )
+			rx, ry, _, _ = self.geometry( self.root.win )
+			cx, cy, _, _ = self.root.pointer()
 
 		# Quit if not within bounds:
 		if not ((wx <= cx <= (wx + ww)) and (wy <= cy <= (wy + wh))): return
@@ -354,25 +956,115 @@ class Driver( DriverMeta ):
 		# Map (cx, cy) to space( win ):
 		return map_coordinates( rx, ry, wx, wy, cx, cy )
 
+	# One XQueryPointer on root (over XCB if enabled), its child (frame)
+	# identifies the window, placed by the geometry cache. Over the frame's
+	# decorations, the pointer is not in the window:
+	@handoff
+	def pointer_window( self ):
+		if self.closed: return
+		p = None
+		if self.xcb:
+			round_trip()
+			p = self.xcb.pointer()
+			if not p and not self._xcb_lost(): return
+
+		cx, cy, child = p or self.root.pointer_child()
+		handle = self.frames.get( child )
+		_id = self.win_map.id( handle ) if handle else None
+		if _id is None: return
+
+		wx, wy, _, _ = self.geometry( handle )
+		rx, ry, _, _ = self.geometry( self.root.win )
+		x, y = map_coordinates( rx, ry, wx, wy, cx, cy )
+		if x < 0 or y < 0: return
+		return (_id, x, y)
+
+	# Drops a broken XCB connection, queries fall back to Xlib:
+	def _xcb_lost( self ):
+		if not self.xcb.broken(): return False
+		print( "XCB connection lost, using Xlib." )
+		self.xcb.close()
+		self.xcb = None
+		return True
+
+	@handoff
 	def window_width( self, _id ):
-		win = find_key( self.win_map, _id )
-		return win.geom()[0][2] if win else None
+		handle = self.win_map.handle( _id ) if not self.closed else None
+		return self.geometry( handle )[2] if handle else None
+
+	# Records the boundaries of _id & places its edge sensors, called on
+	# recompute/relayout, which also follow geometry changes (see resize
+	# of the tracker). The poll backend polls faster near them:
+	@handoff
+	def set_edges( self, _id, show_x, hide_x, shown ):
+		handle = self.win_map.handle( _id ) if not self.closed else None
+		if not handle: return
+		self.edges[handle] = (show_x, hide_x, shown)
+		if self.sensors:
+			self.sensors.set( handle, self.geometry( handle ), show_x,
+							  hide_x, shown )
+
+	def round_trips( self ): return round_trips
 
 	def register_new_window( self, _id ):
-		if find_key( self.win_map, _id ): return
-
-		# Get top level windows:
-		top_windows = XWindow.root( self.disp ).client_list()
-		if not top_windows: return print( "Can't find top level windows" )
-
-		# Bind first non-registered window => _id.
-		for w in filter( is_sublime, top_windows ):
-			if w not in self.win_map:
-				print( "window", w.win, "pid", w.pid(), "title", w.title() )
-				# Register callbacks & bind:
-				w.select_input( EventMask )
-				self.win_map[w] = _id
-				return
-
-	def tracker( self, move, leave ):
-		return MoveEvent( self, move, leave )
\ No newline at end of file
+		self.register_windows( [_id] )
+
+	# Binds ids to sublime clients, only clients new since the last call
+	# are classified. Falls back to fetching the client list if the
+	# PropertyNotify for a new window has not been seen yet:
+	@handoff
+	def register_windows( self, ids ):
+		if self.closed: return
+		ids = [_id for _id in ids if not self.win_map.has_id( _id )]
+		if not ids: return
+
+		unbound = self._candidates()
+		if len( unbound ) < len( ids ):
+			self.refresh_clients()
+			unbound = self._candidates()
+		if not unbound: return print( "Can't find sublime top level windows" )
+
+		for _id in ids:
+			if not unbound: break
+			w = XWindow( self.disp, unbound.pop( 0 ) )
+			print( "window", w.win, "=>", _id )
+			self._bind( w, _id )
+
+	# Register callbacks & bind, an already hovered client gets no
+	# EnterNotify => select motion right away:
+	def _bind( self, w, _id ):
+		w.select_input( self.event_mask )
+		with self.index_lock:
+			old = self.win_map.handle( _id )
+			if old is not None: self._set_frame( old, None )
+			self.win_map.bind( w.win, _id )
+		self.geoms.pop( w.win, None )
+		self._frame( w.win )
+		if self.frames.get( self.root.pointer_child()[2] ) == w.win:
+			self.activity( w.win, inside = True )
+
+	# backend: "core" snoops on events of the sublime windows,
+	# "xinput2" observes XI_RawMotion on root, falls back to "core",
+	# "poll" queries the pointer at a rate given by opts poll_curve,
+	# "sensors" only listens to crossings of sensors sensor_width wide:
+	def tracker( self, move, leave, resize = None, backend = 'core',
+				 poll_curve = None, sensor_width = None, **opts ):
+		if backend == 'sensors':
+			from .sensors import EdgeSensors
+			self.sensors = EdgeSensors( self.disp, sensor_width or 8 )
+			self.select_input( SensorClientMask )
+			return MoveEvent( self, move, leave, resize, **opts )
+		if backend == 'poll':
+			from .poll import PollMoveEvent
+			self.select_input( StructureEventMask )
+			return PollMoveEvent( self, move, leave, resize,
+								  curve = poll_curve, **opts )
+		if backend == 'xinput2':
+			from .xinput2 import RawMoveEvent, xinput2_opcode
+			opcode = xinput2_opcode( self.disp )
+			if opcode is not None:
+				self.select_input( StructureEventMask )
+				return RawMoveEvent( self, move, leave, resize,
+									 opcode = opcode, **opts )
+			print( "XInput2 not available, falling back to core events." )
+		return MoveEvent( self, move, leave, resize, **opts )
\ No newline at end of file
@@ -28,25 +28,70 @@ import atexit
 Utils:
 """
 
-def find_key( _dict, needle ):
-	return next( (k for k, v in _dict.items() if v == needle), None )
-
 # Converts (x, y) from coordinates of system with
 # origin at (xf, yf) to one with origin at (xt - xf, yt - yf).
 def map_coordinates( xf, yf, xt, yt, x, y ):
 	return (x - (xt - xf), y - (yt - yf))
 
+"""
+Window index:
+"""
+
+# A two way index: native window handle <-> sublime window id.
+# Both sides are keyed by raw integers so that lookups allocate nothing.
+class WindowIndex( object ):
+	def __init__( self ):
+		self.by_handle = {}
+		self.by_id = {}
+
+	def __contains__( self, handle ): return handle in self.by_handle
+	def __iter__( self ): return iter( list( self.by_handle ) )
+	def __len__( self ): return len( self.by_handle )
+
+	# Binds handle <=> _id, replacing any earlier binding of either side:
+	def bind( self, handle, _id ):
+		self.unbind( handle )
+		self.unbind_id( _id )
+		self.by_handle[handle] = _id
+		self.by_id[_id] = handle
+
+	def unbind( self, handle ):
+		_id = self.by_handle.pop( handle, None )
+		if _id is not None: self.by_id.pop( _id, None )
+		return _id
+
+	def unbind_id( self, _id ):
+		handle = self.by_id.pop( _id, None )
+		if handle is not None: self.by_handle.pop( handle, None )
+		return handle
+
+	# Sublime id of handle / handle of sublime id, or None:
+	def id( self, handle ): return self.by_handle.get( handle )
+	def handle( self, _id ): return self.by_id.get( _id )
+	def has_id( self, _id ): return _id in self.by_id
+
 """
 Move driver:
 """
 class MoveEventMeta( Thread ):
-	def __init__( self, driver, move, leave, daemon = True ):
+	# batch: drain & coalesce pending events, max_rate: batches / sec (0 = inf).
+	# resize( _id ), if given, is called when the size of a window changes.
+	# stats: a stats.Stats to instrument the tracker with, or None.
+	# recorder: a record.Recorder capturing what move & leave receive, or None.
+	def __init__( self, driver, move, leave, resize = None, daemon = True,
+				  batch = False, max_rate = 0, stats = None, recorder = None ):
 		Thread.__init__( self )
 		self.daemon = daemon
 		self.alive = False
 		self.driver = driver
 		self.move = move
 		self.leave = leave
+		self.resize = resize
+		self.batch = batch
+		self.max_rate = max_rate
+		self.stats = stats
+		self.recorder = recorder
+		if recorder: self.move, self.leave = recorder.hooks( move, leave )
 
 	def start( self ):
 		self.alive = True
@@ -56,6 +101,7 @@ class MoveEventMeta( Thread ):
 		if self.alive:
 			self.alive = False
 			self._stopx()
+			if self.recorder: self.recorder.flush()
 
 	def _stopx( self ): pass
 	def run( self ): pass
@@ -64,8 +110,25 @@ class MoveEventMeta( Thread ):
 Driver:
 """
 class DriverMeta( object ):
-	def __init__( self ): pass
+	def __init__( self ): self.win_map = WindowIndex()
 	def window_coordinates( self, _id ): pass
+
+	# Returns (_id, x, y) of the registered window under the pointer, in
+	# its coordinates, or None. Drivers may answer with one pointer query:
+	def pointer_window( self ):
+		for handle in self.win_map:
+			_id = self.win_map.id( handle )
+			r = self.window_coordinates( _id )
+			if r: return (_id,) + tuple( r )
 	def window_width( self, _id ): pass
 	def register_new_window( self, _id ): pass
-	def tracker( self, move, leave ): pass
\ No newline at end of file
+
+	# Binds many sublime windows at once, drivers may do it in one pass:
+	def register_windows( self, ids ):
+		for _id in ids: self.register_new_window( _id )
+	def tracker( self, move, leave, resize = None, **opts ): pass
+	def round_trips( self ): return 0
+
+	# The show edge [0, show_x) & hide boundary hide_x of window _id changed,
+	# or whether the sidebar is shown. For drivers sensing edges only:
+	def set_edges( self, _id, show_x, hide_x, shown ): pass
\ No newline at end of file
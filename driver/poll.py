@@ -0,0 +1,99 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Pointer tracking by polling XQueryPointer on the root window, for when
+# selecting PointerMotionMask on foreign clients gets nothing or conflicts
+# (XWayland, some compositing WMs). The poll interval adapts: fast near
+# the active hide/show boundary of a sublime window, slow far from all
+# of them and backing off further while the pointer rests. Polls are
+# timers of the tracker loop, which keeps handling structure events in
+# between.
+#
+from .xinput2 import PointerMoveEvent
+from time import perf_counter
+
+"""
+Poll rate:
+"""
+
+# (min_ms, max_ms, near_px, far_px): poll every min_ms within near_px of
+# an edge, every max_ms beyond far_px, linearly in between:
+DEFAULT_CURVE = (8, 250, 32, 400)
+
+# Intervals of a resting pointer are doubled up to this many times:
+BACKOFF_MAX = 8
+
+# Seconds between polls for a pointer distance px away from an edge:
+def poll_interval( curve, px ):
+	lo, hi, near, far = curve
+	if px <= near: ms = lo
+	elif px >= far: ms = hi
+	else: ms = lo + (hi - lo) * (px - near) / (far - near)
+	return ms / 1000
+
+"""
+Move event logic:
+"""
+
+class PollMoveEvent( PointerMoveEvent ):
+	def __init__( self, driver, move, leave, resize = None, curve = None,
+				  **opts ):
+		super().__init__( driver, move, leave, resize, **opts )
+		self.curve = tuple( curve or DEFAULT_CURVE )
+		self.last = None
+		self.backoff = 1
+
+	def run( self ):
+		self.call_later( 0, self._poll )
+		super().run()
+
+	def _poll( self ):
+		if not self.alive: return
+		t0 = perf_counter() if self.stats else None
+		p = self.driver.root.pointer_child()
+		moved = p != self.last
+		if moved:
+			self.last = p
+			self._route( 1, *p, t0 = t0 )
+
+		self.backoff = 1 if moved else min( self.backoff * 2, BACKOFF_MAX )
+		wait = poll_interval( self.curve, self._distance( p[0], p[1] ) )
+		self.call_later( min( wait * self.backoff, self.curve[1] / 1000 ),
+						 self._poll )
+
+	# Pixels from root (x, y) to the nearest active boundary of a sublime
+	# window: hide_x while its sidebar is shown, else show_x (see set_edges),
+	# its left edge until the wrapper reported them:
+	def _distance( self, x, y ):
+		d = self.driver
+		best = self.curve[3]
+		for handle in d.win_map:
+			wx, wy, ww, wh = d.geometry( handle )
+			edges = d.edges.get( handle )
+			if edges:
+				show_x, hide_x, shown = edges
+				wx += hide_x if shown else show_x
+			dy = max( wy - y, 0, y - (wy + wh) )
+			best = min( best, max( abs( x - wx ), dy ) )
+		return best
@@ -0,0 +1,97 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Compact binary recording of pointer traces:
+# fixed width records (timestamp, window id, x, y, kind) are packed into a
+# preallocated buffer by the tracker and flushed to a file, in one write,
+# each time it wraps around. Files are memory mapped when read back,
+# see bench/replay.py. Timestamps are absolute (seconds since the epoch)
+# so sessions appended to the same file follow each other.
+#
+from struct import Struct
+from threading import Lock
+from time import perf_counter, time
+from mmap import mmap, ACCESS_READ
+import os
+
+MAGIC = b"ASTR"
+VERSION = 1
+HEADER = Struct( "<4sHH" )		# magic, version, record size
+RECORD = Struct( "<dqiiB7x" )	# epoch seconds, window id, x, y, kind
+MOVE, LEAVE = 0, 1
+
+class Recorder( object ):
+	def __init__( self, path, capacity = 65536 ):
+		self.path = path
+		self.capacity = capacity
+		self.buf = bytearray( RECORD.size * capacity )
+		self.count = 0
+		self.lock = Lock()
+		# Wall clock at session start, advanced by perf_counter: absolute
+		# yet precise & monotonic within the session:
+		self.base = time() - perf_counter()
+
+	def add( self, _id, x, y, kind ):
+		with self.lock:
+			RECORD.pack_into( self.buf, self.count * RECORD.size,
+				self.base + perf_counter(), _id, x, y, kind )
+			self.count += 1
+			if self.count == self.capacity: self._flush()
+
+	# Wraps the move & leave callbacks of a tracker:
+	def hooks( self, move, leave ):
+		def rmove( _id, x, y ):
+			if _id is not None: self.add( _id, x, y, MOVE )
+			move( _id, x, y )
+		def rleave( _id ):
+			if _id is not None: self.add( _id, 0, 0, LEAVE )
+			leave( _id )
+		return (rmove, rleave)
+
+	def flush( self ):
+		with self.lock: self._flush()
+
+	# Appends buffered records, writes the header to new files:
+	def _flush( self ):
+		if not self.count: return
+		with open( self.path, "ab" ) as f:
+			if not f.tell():
+				f.write( HEADER.pack( MAGIC, VERSION, RECORD.size ) )
+			with memoryview( self.buf ) as mv:
+				f.write( mv[:self.count * RECORD.size] )
+		self.count = 0
+
+# Yields records (seconds, window id, x, y, kind) of a recorded trace:
+def read_trace( path ):
+	with open( path, "rb" ) as f:
+		if not os.fstat( f.fileno() ).st_size: return
+		with mmap( f.fileno(), 0, access = ACCESS_READ ) as m:
+			magic, version, size = HEADER.unpack_from( m )
+			if magic != MAGIC or size != RECORD.size:
+				raise ValueError( "Not a trace file: %s" % path )
+			body = len( m ) - HEADER.size
+			body -= body % size
+			with memoryview( m ) as mv:
+				for r in RECORD.iter_unpack( mv[HEADER.size:HEADER.size + body] ):
+					yield r
@@ -0,0 +1,93 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Edge sensors: thin InputOnly children of each sublime window, one along
+# the show edge [0, show_x) while the sidebar is hidden and one at the
+# hide boundary hide_x while it is shown. The tracker only gets their
+# Enter/LeaveNotify:s instead of all motion over the window.
+#
+# Caveat: the sensors are input windows on top of sublime's own. Clicks on
+# them propagate to sublime's window, but sublime's widgets underneath do
+# not see the pointer (or set the cursor) while it is over a sensor. Very
+# fast moves may also jump over the hide sensor, leaving the window still
+# hides the sidebar.
+#
+from .X11 import X11, Window, x_lock, EnterWindowMask, LeaveWindowMask
+from ctypes import *
+
+InputOnly = 2
+CopyFromParent = 0
+SensorMask = EnterWindowMask | LeaveWindowMask
+
+X11.XCreateWindow.restype = Window
+
+class EdgeSensors( object ):
+	def __init__( self, disp, width ):
+		self.disp = disp
+		self.width = width
+		# client handle => [show, hide] sensor handles,
+		# sensor handle => (client handle, x) and last placement:
+		self.pairs = {}
+		self.origins = {}
+		self.placed = {}
+
+	# Returns (client handle, x in client) of a sensor handle, else None:
+	def origin( self, handle ): return self.origins.get( handle )
+
+	# Places & (un)maps the sensors of client handle of geometry geom:
+	def set( self, handle, geom, show_x, hide_x, shown ):
+		show, hide = self.pairs.get( handle ) or self._create( handle )
+		width, height = geom[2:]
+		self._place( handle, show, 0, max( 1, show_x ), height, not shown )
+		self._place( handle, hide, hide_x, self.width, height,
+					 shown and hide_x < width )
+		with x_lock( self.disp ): X11.XFlush( self.disp )
+
+	def _create( self, handle ):
+		with x_lock( self.disp ):
+			pair = [X11.XCreateWindow( self.disp, Window( handle ), 0, 0, 1, 1,
+						0, CopyFromParent, InputOnly, None, 0, None )
+					for _ in range( 2 )]
+			for sensor in pair:
+				X11.XSelectInput( self.disp, Window( sensor ), SensorMask )
+		self.pairs[handle] = pair
+		return pair
+
+	def _place( self, handle, sensor, x, width, height, mapped ):
+		at = (x, width, height, mapped) if mapped else None
+		if sensor in self.placed and self.placed[sensor] == at: return
+		self.placed[sensor] = at
+		with x_lock( self.disp ):
+			if mapped:
+				self.origins[sensor] = (handle, x)
+				X11.XMoveResizeWindow( self.disp, Window( sensor ), x, 0,
+									   width, height )
+				X11.XMapRaised( self.disp, Window( sensor ) )
+			else: X11.XUnmapWindow( self.disp, Window( sensor ) )
+
+	# Client handle is gone, the server destroyed its sensors with it:
+	def forget( self, handle ):
+		for sensor in self.pairs.pop( handle, () ):
+			self.origins.pop( sensor, None )
+			self.placed.pop( sensor, None )
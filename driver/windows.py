@@ -21,7 +21,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from .base import DriverMeta, MoveEventMeta, find_key, map_coordinates
+from .base import DriverMeta, MoveEventMeta, map_coordinates
 
 from ctypes import *
 from ctypes.wintypes import BOOL, HWND, LONG, INT, WPARAM, LPARAM, DWORD
@@ -124,11 +124,12 @@ def coordinates_and_hwnd( win_map ):
 	user32.GetPhysicalCursorPos( byref( p ) )
 	x, y = p.x, p.y
 	hwnd = get_hwnd( x, y )
-	if not (hwnd and hwnd in win_map): return
+	_id = win_map.id( hwnd ) if hwnd else None
+	if _id is None: return
 
 	# Map cursor pos to window coordinates:
 	rect = window_rect( hwnd )
-	return ((map_coordinates( 0, 0, rect.l, rect.t, x, y ), win_map[hwnd])
+	return ((map_coordinates( 0, 0, rect.l, rect.t, x, y ), _id)
 			if rect else None)
 #	DPI scaling issues? the outcommented code works fine
 #	on non-scaled, works bad on scaled.
@@ -170,6 +171,7 @@ class MoveEvent( MoveEventMeta ):
 		r = coordinates_and_hwnd( self.driver.win_map )
 		if not r: return
 		(x, y), window = r
+		if self.stats: self.stats.window( window ).events += 1
 
 		# Add to stack of entered_window:
 		ew = self.driver.entered_windows
@@ -187,12 +189,14 @@ Public API
 """
 
 class Driver( DriverMeta ):
-	def __init__( self ):
-		self.win_map = {}
+	# Options of other platforms (e.g. coordinates) do not apply:
+	def __init__( self, **opts ):
+		super().__init__()
 		self.entered_windows = []
 
 	def window_width( self, _id ):
-		rect = window_rect( find_key( self.win_map, _id ) )
+		hwnd = self.win_map.handle( _id )
+		rect = window_rect( hwnd ) if hwnd else None
 		return rect.r - rect.l if rect else None
 
 	def window_coordinates( self, _id ):
@@ -201,16 +205,36 @@ class Driver( DriverMeta ):
 		xy, window = r
 		return xy if window == _id else None
 
+	def pointer_window( self ):
+		r = coordinates_and_hwnd( self.win_map )
+		if not r: return
+		xy, window = r
+		return (window,) + tuple( xy )
+
 	def register_new_window( self, _id ):
-		windows = self.win_map.values()
-		if _id in windows: return
+		if self.win_map.has_id( _id ): return
 
 		def cb( hwnd, lParam ):
 			if (hwnd in self.win_map) or (not is_sublime( hwnd )): return 1
-			self.win_map[hwnd] = _id
+			self.win_map.bind( hwnd, _id )
 			return 0
 
 		user32.EnumWindows( EnumWindowsProc( cb ), None )
 
-	def tracker( self, move, leave ):
-		return MoveEvent( self, move, leave )
\ No newline at end of file
+	# One EnumWindows pass for all of ids:
+	def register_windows( self, ids ):
+		ids = [_id for _id in ids if not self.win_map.has_id( _id )]
+		if not ids: return
+
+		def cb( hwnd, lParam ):
+			if (hwnd in self.win_map) or (not is_sublime( hwnd )): return 1
+			self.win_map.bind( hwnd, ids.pop( 0 ) )
+			return 1 if ids else 0
+
+		user32.EnumWindows( EnumWindowsProc( cb ), None )
+
+	# Batching does not apply to the low level hook, other opts are ignored.
+	# There are no resize notifications, sublime's on_activated covers it:
+	def tracker( self, move, leave, resize = None, **opts ):
+		return MoveEvent( self, move, leave, stats = opts.get( 'stats' ),
+						  recorder = opts.get( 'recorder' ) )
\ No newline at end of file
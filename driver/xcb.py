@@ -0,0 +1,147 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Pipelined queries over XCB: requests are all sent before the first reply
+# is waited for, so a window's geometry, its origin on root & the pointer
+# cost one round trip latency. Uses its own connection, replies & errors
+# are allocated by XCB and freed with libc's free. A query returning None
+# may mean the connection broke, see broken().
+#
+from ctypes import *
+from ctypes.util import find_library
+
+"""
+XCB types:
+"""
+
+class Cookie( Structure ):
+	_fields_ = [('sequence', c_uint)]
+
+class GetGeometryReply( Structure ):
+	_fields_ = [
+		('response_type', c_uint8), ('depth', c_uint8),
+		('sequence', c_uint16), ('length', c_uint32),
+		('root', c_uint32),
+		('x', c_int16), ('y', c_int16),
+		('width', c_uint16), ('height', c_uint16),
+		('border_width', c_uint16), ('pad', c_uint8 * 2)
+	]
+
+class TranslateCoordinatesReply( Structure ):
+	_fields_ = [
+		('response_type', c_uint8), ('same_screen', c_uint8),
+		('sequence', c_uint16), ('length', c_uint32),
+		('child', c_uint32),
+		('dst_x', c_int16), ('dst_y', c_int16)
+	]
+
+class QueryPointerReply( Structure ):
+	_fields_ = [
+		('response_type', c_uint8), ('same_screen', c_uint8),
+		('sequence', c_uint16), ('length', c_uint32),
+		('root', c_uint32), ('child', c_uint32),
+		('root_x', c_int16), ('root_y', c_int16),
+		('win_x', c_int16), ('win_y', c_int16),
+		('mask', c_uint16), ('pad', c_uint8 * 2)
+	]
+
+def xcb_lib():
+	path = find_library( "xcb" )
+	if not path: return
+	xcb = CDLL( path )
+	xcb.xcb_connect.restype = c_void_p
+	xcb.xcb_connect.argtypes = [c_char_p, POINTER( c_int )]
+	xcb.xcb_connection_has_error.argtypes = [c_void_p]
+	xcb.xcb_disconnect.argtypes = [c_void_p]
+	for name, reply in (('get_geometry', GetGeometryReply),
+						('translate_coordinates', TranslateCoordinatesReply),
+						('query_pointer', QueryPointerReply)):
+		request = getattr( xcb, 'xcb_' + name )
+		request.restype = Cookie
+		get = getattr( xcb, 'xcb_%s_reply' % name )
+		get.restype = POINTER( reply )
+		get.argtypes = [c_void_p, Cookie, POINTER( c_void_p )]
+	xcb.xcb_get_geometry.argtypes = [c_void_p, c_uint32]
+	xcb.xcb_translate_coordinates.argtypes = [c_void_p, c_uint32, c_uint32,
+											  c_int16, c_int16]
+	xcb.xcb_query_pointer.argtypes = [c_void_p, c_uint32]
+	return xcb
+
+XCB = xcb_lib()
+libc = CDLL( find_library( "c" ) )
+libc.free.argtypes = [c_void_p]
+
+# Waits for the reply of cookie, returns a copy of it or None on error.
+# The error is taken (& freed) here, else XCB queues it as an event:
+def reply( get, conn, cookie ):
+	error = c_void_p()
+	r = get( conn, cookie, byref( error ) )
+	if error: libc.free( error )
+	if not r: return
+	try: return r.contents.__class__.from_buffer_copy( r.contents )
+	finally: libc.free( r )
+
+class XcbQueries( object ):
+	def __init__( self, conn, root ):
+		self.conn = conn
+		self.root = root
+
+	# Returns XcbQueries on a new connection, None if XCB is unavailable:
+	def connect( root ):
+		if not XCB: return
+		conn = XCB.xcb_connect( None, None )
+		if XCB.xcb_connection_has_error( conn ):
+			XCB.xcb_disconnect( conn )
+			return
+		return XcbQueries( conn, root )
+
+	# Returns ((x, y, width, height) of window in root, (x, y) of pointer
+	# on root), or None. All three requests are sent at once:
+	def window_and_pointer( self, win ):
+		c = self.conn
+		geometry = XCB.xcb_get_geometry( c, win )
+		origin = XCB.xcb_translate_coordinates( c, win, self.root, 0, 0 )
+		pointer = XCB.xcb_query_pointer( c, self.root )
+
+		g = reply( XCB.xcb_get_geometry_reply, c, geometry )
+		o = reply( XCB.xcb_translate_coordinates_reply, c, origin )
+		p = reply( XCB.xcb_query_pointer_reply, c, pointer )
+		if not (g and o and p): return
+		return ((o.dst_x, o.dst_y, g.width, g.height), (p.root_x, p.root_y))
+
+	# Returns (x, y, child) of the pointer on root, or None:
+	def pointer( self ):
+		c = self.conn
+		p = reply( XCB.xcb_query_pointer_reply, c,
+				   XCB.xcb_query_pointer( c, self.root ) )
+		return (p.root_x, p.root_y, p.child) if p else None
+
+	# Whether the connection is closed or broke (e.g. the server went away),
+	# every query then fails:
+	def broken( self ):
+		return not self.conn or bool( XCB.xcb_connection_has_error( self.conn ) )
+
+	def close( self ):
+		if self.conn: XCB.xcb_disconnect( self.conn )
+		self.conn = None
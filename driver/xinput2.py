@@ -0,0 +1,145 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Passive pointer tracking via XInput2 raw events on the root window.
+# Unlike the core backend, the event stream of sublime:s windows is never
+# touched: XI_RawMotion only tells that the pointer moved, one XQueryPointer
+# per batch then resolves which sublime window (if any) is under it.
+#
+from .X11 import MoveEvent, GenericEvent, x_lock, X11
+from ctypes import *
+from ctypes.util import find_library
+from time import perf_counter
+
+"""
+XInput2 types & constants:
+"""
+
+class XIEventMask( Structure ):
+	_fields_ = [
+		('deviceid', c_int),
+		('mask_len', c_int),
+		('mask', POINTER( c_ubyte ))
+	]
+
+XIAllMasterDevices = 1
+XI_RawMotion = 17
+XI_MAJOR, XI_MINOR = 2, 1
+
+def xi_lib():
+	path = find_library( "Xi" )
+	return CDLL( path ) if path else None
+
+Xi = xi_lib()
+
+# Returns the major opcode of XInput if >= 2.1 is supported, else None:
+def xinput2_opcode( disp ):
+	if not Xi: return
+	opcode, event, error = c_int(), c_int(), c_int()
+	major, minor = c_int( XI_MAJOR ), c_int( XI_MINOR )
+	with x_lock( disp ):
+		if not X11.XQueryExtension( disp, c_char_p( b"XInputExtension" ),
+				byref( opcode ), byref( event ), byref( error ) ): return
+		if Xi.XIQueryVersion( disp, byref( major ), byref( minor ) ): return
+	if (major.value, minor.value) < (XI_MAJOR, XI_MINOR): return
+	return opcode.value
+
+# Selects XI_RawMotion events of all master devices on window:
+def select_raw_motion( disp, win ):
+	mask = (c_ubyte * ((XI_RawMotion >> 3) + 1))()
+	mask[XI_RawMotion >> 3] |= 1 << (XI_RawMotion & 7)
+	m = XIEventMask( XIAllMasterDevices, len( mask ), mask )
+	with x_lock( disp ):
+		Xi.XISelectEvents( disp, win, byref( m ), 1 )
+		X11.XFlush( disp )
+
+"""
+Move event logic:
+"""
+
+# Tracks the pointer by querying it, routes to the window under it:
+class PointerMoveEvent( MoveEvent ):
+	def __init__( self, driver, move, leave, resize = None, **opts ):
+		super().__init__( driver, move, leave, resize, **opts )
+		self.hovered = None
+
+	# Resolves window under pointer and routes move/leave,
+	# n raw events were received & coalesced into this:
+	def _pointer( self, n ):
+		t0 = perf_counter() if self.stats else None
+		self._route( n, *self.driver.root.pointer_child(), t0 = t0 )
+
+	# Routes a pointer at root (x, y) over top level child, see _pointer().
+	# Over the decorations of the frame (x or y < 0 in the client), the
+	# pointer is not in the client, as a LeaveNotify would tell:
+	def _route( self, n, x, y, child, t0 = None ):
+		d = self.driver
+		stats = self.stats
+		if stats: t1 = perf_counter()
+		handle = d.frames.get( child )
+		_id = d.win_map.id( handle ) if handle else None
+		if _id is not None:
+			wx, wy, _, _ = d.geometry( handle )
+			x, y = x - wx, y - wy
+			if x < 0 or y < 0: _id = None
+		if stats:
+			ws = stats.window( _id )
+			ws.time( 'lookup', t1 )
+			ws.events += n
+			ws.coalesced += n - 1
+			if _id is None: ws.lookup_misses += 1
+
+		# Left the previously hovered window:
+		if self.hovered is not None and self.hovered != _id:
+			self.leave( self.hovered )
+		self.hovered = _id
+		if _id is None: return
+
+		self.move( _id, x, y )
+		if stats: ws.time( 'event', t0 )
+
+class RawMoveEvent( PointerMoveEvent ):
+	def __init__( self, driver, move, leave, resize = None, opcode = None,
+				  **opts ):
+		super().__init__( driver, move, leave, resize, **opts )
+		self.opcode = opcode
+
+	def run( self ):
+		select_raw_motion( self.driver.disp, self.driver.root.win )
+		super().run()
+
+	def _accept( self, e ):
+		if e.type == GenericEvent:
+			c = e.xcookie
+			return c.extension == self.opcode and c.evtype == XI_RawMotion
+		return super()._accept( e )
+
+	# Raw motion carries no window: all of a batch is one pointer query:
+	def _dispatch( self, batch ):
+		moved = 0
+		for e in batch:
+			if e.type == GenericEvent: moved += 1
+			else: self._structure( e )
+
+		if moved: self._pointer( moved )
@@ -35,9 +35,19 @@ ID = 'sublime-autohide-sidebar'
 #
 # Import stuff:
 #
-from sublime import active_window, windows, load_settings, set_timeout_async
-from sublime_plugin import EventListener
-from .counter import Counter
+import json
+from sys import maxsize
+from os.path import expanduser
+from time import monotonic, perf_counter
+from sublime import active_window, windows, load_settings, set_timeout,\
+				   set_timeout_async
+from sublime_plugin import EventListener, WindowCommand
+from .debounce import Debouncer
+from .dispatch import Dispatcher
+from .stats import Stats
+from .timerwheel import TimerWheel
+from .config import Config, project_overrides
+from .driver.record import Recorder
 
 #
 # Cross platform mouse movement event handler 
@@ -49,27 +59,86 @@ from .driver import Driver
 #
 HIDE_DEFAULT_X = 450
 
-def hs_padding_x():
-	global settings
-	return settings.get( 'hide_show_padding_x' )
+# Milliseconds to let sublime relayout before recomputing boundaries:
+RELAYOUT_DELAY = 50
+
+# Window commands that change the layout of the editor area:
+LAYOUT_COMMANDS = frozenset( ['set_layout', 'new_pane', 'close_pane',
+	'toggle_minimap', 'toggle_full_screen', 'toggle_distraction_free',
+	'toggle_tabs', 'toggle_status_bar'] )
+
+# Window commands after which the sidebar visibility is unknown:
+RESYNC_COMMANDS = frozenset( ['toggle_distraction_free', 'open_project',
+	'close_project', 'close_workspace', 'prompt_select_workspace',
+	'prompt_open_project_or_workspace'] )
+
+# Seconds since the last pointer event after which the pointer is resting:
+DWELL_WINDOW = 0.05
+
+# Snapshot of the settings, rebuilt when they change, see Config:
+CONFIG = None
+
+# Instrumentation, a Stats if enabled in settings:
+STATS = None
+
+# Pending hover intents of all windows, ticked on sublime's thread:
+WHEEL = TimerWheel( set_timeout )
 
 #
 # Per window wrapper:
 #
 class Wrapper( object ):
 	def __init__( self, window ):
-		global D
 		self.id = window.id()
 		self.window = window
 		self.toggled = False
 		self.suspended = False
+		self.flips = 0
+		self.stats = STATS.window( self.id ) if STATS else None
+
+		# Cached sidebar visibility, None => unknown, see resync():
+		self.sidebar = None
+
+		# Precomputed boundaries, see recompute():
+		self.show_x = 0
+		self.hide_x = maxsize
+
+		# Hover intent, see intend(): delays, dwell speed (px/s) & last sample:
+		self.intent = None
+		self.show_delay = self.hide_delay = self.dwell = 0
+		self.speed = self.last_x = self.last_t = 0
 
-		D.register_new_window( self.id )
+		# Settings with the overrides of the window's project:
+		self.configure()
+
+	# Resolves the settings of the window, on registration & changes:
+	def configure( self ):
+		global CONFIG
+		self.config = CONFIG.override( project_overrides( self.window ) )
+
+	# Hides the sidebar initially, once bound in the driver
+	# and reachable via wrapper( id ):
+	def start( self ):
+		self.recompute()
 		if self.is_sidebar_open(): self._toggle()
 
+	# Whether or not the sidebar is visible, from cache unless unknown:
+	def is_sidebar_open( self ):
+		if self.sidebar is None: self.resync()
+		return self.sidebar
+
+	# Sidebar toggled (by anyone): flip the cached visibility:
+	def sidebar_toggled( self ):
+		if self.sidebar is not None: self.sidebar = not self.sidebar
+
+	# Rare path: (re)learns the sidebar visibility from sublime:
+	def resync( self ):
+		visible = getattr( self.window, 'is_sidebar_visible', None )
+		self.sidebar = visible() if visible else self._probe_sidebar()
+
 	# Thanks https://github.com/titoBouzout
 	# https://github.com/SublimeText/SideBarFolders/blob/fb4b2ba5b8fe5b14453eebe8db05a6c1b918e029/SideBarFolders.py#L59-L75
-	def is_sidebar_open( self ):
+	def _probe_sidebar( self ):
 		view = self.window.active_view()
 		if view:
 			sel1 = view.sel()[0]
@@ -89,47 +158,134 @@ class Wrapper( object ):
 		return True # by default assume it's open if no view is opened
 
 	# Toggles the sidebar:
-	def _toggle( self ): self.window.run_command( "toggle_side_bar", ID )
+	def _toggle( self ):
+		s = self.stats
+		if s: t0 = perf_counter()
+		self.window.run_command( "toggle_side_bar", ID )
+		self.relayout()
+		if s:
+			s.toggles += 1
+			s.time( 'toggle', t0 )
+
+	# Recomputes the hide/show boundaries, only on real layout changes:
+	def recompute( self ):
+		global D
+		c = self.config
+		pad = c.hide_show_padding_x
+		w = D.window_width( self.id ) or HIDE_DEFAULT_X
+		view = self.window.active_view()
+		w2 = (view.viewport_extent()[0] if view else 0) or 0
+		self.show_x = pad
+		self.hide_x = int( w - w2 - pad * 2 )
+		self.show_delay = c.show_delay_ms or 0
+		self.hide_delay = c.hide_delay_ms or 0
+		self.dwell = c.dwell_velocity or 0
+		self.edges()
+
+	# Tells the driver where the edges are, e.g: to place its edge sensors:
+	def edges( self ):
+		global D
+		D.set_edges( self.id, self.show_x, self.hide_x, self.toggled )
+
+	# Layout is changing: never hide until boundaries are recomputed:
+	def relayout( self ):
+		self.hide_x = maxsize
+		self.edges()
+		set_timeout( self.recompute, RELAYOUT_DELAY )
 
 	def toggle_suspended( self ):
+		self.cancel_intent()
 		self.suspended = not self.suspended
 		self.toggled = not self.toggled
 
 	# Given an x coordinate: whether or not sidebar should hide:
-	def should_hide( self, x ):
-		global D
-		w = D.window_width( self.id ) or HIDE_DEFAULT_X
-		w2 = self.window.active_view().viewport_extent()[0] or 0
-		return x >= (w - w2 - hs_padding_x() * 2)
+	def should_hide( self, x ): return x >= self.hide_x
 
 	# Given an x coordinate: whether or not sidebar should show:
-	def should_show( self, x ): return x < hs_padding_x()
-
-	# Toggles side bar if pred is fulfilled and flips toggled state:
-	def win_if_toggle( self, pred ):
-		if self.suspended: return
-		if pred( self.toggled ):
-			self.toggled = not self.toggled
-			self._toggle()
+	def should_show( self, x ): return x < self.show_x
 
-	# Hides sidebar if it should be hidden, or shows if it should:
-	def hide_or_show( self ):
-		global D
+	# Flips toggled state, the sidebar is toggled by commit():
+	def flip( self ):
+		self.cancel_intent()
+		self.toggled = not self.toggled
+		self.flips += 1
+		# Shown: never hide until boundaries are recomputed:
+		if self.toggled: self.hide_x = maxsize
+
+	# Toggles the sidebar once for an odd number of flips,
+	# opposing flips (e.g. show, then hide) cancel each other out:
+	def commit( self ):
+		flips, self.flips = self.flips, 0
+		if flips % 2: self._toggle()
+		elif flips: self.recompute()
+
+	# Hides sidebar if it should be hidden, or shows if it should,
+	# r: pointer (x, y) in the window, None if it is elsewhere:
+	def hide_or_show( self, r ):
 		if self.suspended: return
-		r = D.window_coordinates( self.id )
+		self.cancel_intent()
 		self.toggled = (not self.should_hide( r[0] )
 						if self.is_sidebar_open()
 						else self.should_show( r[0] ) )\
 						if r else False
 		if (self.toggled if r else self.is_sidebar_open()): self._toggle()
 
-	# On move handler:
-	def move( self, x ):
-		self.win_if_toggle( lambda s:
-			(self.should_hide if s else self.should_show)( x ))
+	# On move handler, hot path: only compares against cached boundaries.
+	# t: monotonic time the tracker saw the move at:
+	def move( self, x, t ):
+		if self.suspended: return
+		s = self.stats
+		if s: t0 = perf_counter()
+		hit = (x >= self.hide_x) if self.toggled else (x < self.show_x)
+		if s:
+			s.predicates += 1
+			s.time( 'predicate', t0 )
+		if self.dwell: self.sample( x, t )
+		if hit: self.intend()
+		elif self.intent: self.cancel_intent()
 
 	# On leave handler:
-	def leave( self ): self.win_if_toggle( lambda s: s )
+	def leave( self ):
+		if self.suspended: return
+		if self.toggled: self.intend()
+		else: self.cancel_intent()
+
+	# Pointer speed in px/s between the last two moves, as timed by the
+	# tracker: moves are handled in batches, long after they happened:
+	def sample( self, x, t ):
+		dt = t - self.last_t
+		if dt > 0: self.speed = abs( x - self.last_x ) / dt
+		self.last_x, self.last_t = x, t
+
+	# Whether the pointer is still passing by faster than the dwell speed:
+	def passing( self ):
+		return (self.speed > self.dwell and
+				monotonic() - self.last_t < DWELL_WINDOW)
+
+	# Pointer entered a hide/show zone: flip now, or once the pointer
+	# has stayed for the delay (& slowed down below the dwell speed):
+	def intend( self ):
+		if self.intent: return
+		dwell = not self.toggled and self.dwell
+		delay = self.hide_delay if self.toggled else self.show_delay
+		if not (delay or dwell): self.flip()
+		else: self.intent = WHEEL.add( delay, self.intended )
+
+	# Pointer left the zone before the intent was due:
+	def cancel_intent( self ):
+		if self.intent:
+			WHEEL.cancel( self.intent )
+			self.intent = None
+
+	# Intent is due, outside of a dispatched batch => commit right away:
+	def intended( self ):
+		self.intent = None
+		if self.suspended: return
+		if not self.toggled and self.dwell and self.passing():
+			self.intent = WHEEL.add( 0, self.intended )
+			return
+		self.flip()
+		self.commit()
 
 #
 # Making and getting wrappers:
@@ -145,11 +301,23 @@ def wrapper( _id ):
 
 # Registers a new window:
 def register_new( window ):
-	global wrappers
+	global wrappers, D
+	D.register_new_window( window.id() )
 	w = Wrapper( window )
 	wrappers[w.id] = w
+	w.start()
 	return w
 
+# Registers all windows in one pass of the driver,
+# sidebars are probed & hidden later, off the startup path:
+def register_all( _windows ):
+	global wrappers, D
+	D.register_windows( [window.id() for window in _windows] )
+	for window in _windows:
+		w = Wrapper( window )
+		wrappers[w.id] = w
+		set_timeout( w.start, 0 )
+
 # Returns the wrapper, registers it if not:
 def wrapper_or_register( window ):
 	global wrappers
@@ -160,52 +328,177 @@ def wrapper_or_register( window ):
 # Plugin listeners & loading:
 #
 
-# Get an on_load_counter, or set one if not before:
-on_load_counters = {}
-def on_load_counter( _id ):
-	global on_load_counters
-	if _id not in on_load_counters: on_load_counters[_id] = Counter()
-	return on_load_counters[_id]
+# Hides/shows sidebars of wrappers with a single pointer query:
+def hide_or_show_all( ws ):
+	global D
+	p = D.pointer_window()
+	for w in ws: w.hide_or_show( p[1:] if p and p[0] == w.id else None )
+
+# Last on_load in a storm => make or get wrapper and hide/show it,
+# together with other windows settling in the same tick (e.g. a session):
+settled = []
+def loaded( window ):
+	if not settled: set_timeout( hide_or_show_settled, 0 )
+	settled.append( wrapper_or_register( window ) )
+
+def hide_or_show_settled():
+	ws = list( settled )
+	del settled[:]
+	hide_or_show_all( ws )
+
+loads = Debouncer( set_timeout, loaded )
+
+# Handles tracker output on sublime's thread: (_id, x, t) for moves,
+# (_id, None, t) for leaves. Toggles are committed once per batch:
+def dispatched( items ):
+	global wrappers
+	touched = set()
+	for _id, x, t in items:
+		w = wrappers.get( _id )
+		if not w: continue
+		if x is None: w.leave()
+		else: w.move( x, t )
+		touched.add( w )
+	for w in touched: w.commit()
+
+# Dispatcher key: moves of a window supersede each other, leaves are kept:
+def moved_window( item ): return item[0] if item[1] is not None else None
+
+# Stats: tracker output dropped as the queue was full:
+def dropped( item ):
+	global STATS
+	if STATS: STATS.window( item[0] ).dropped += 1
+
+# Settings changed: snapshot them, wrappers resolve theirs on next tick:
+def settings_changed():
+	global CONFIG, settings
+	CONFIG = Config.load( settings )
+	set_timeout( reconfigure_all, 0 )
+
+# Resolves settings & recomputes boundaries of all wrappers:
+def reconfigure_all():
+	global wrappers
+	for w in list( wrappers.values() ):
+		w.configure()
+		w.recompute()
+
+# Returns the wrapper of window if it has one:
+def wrapper_of( window ):
+	global wrappers
+	return wrappers.get( window.id() ) if window else None
+
+# Relayouts the wrapper of window if it has one:
+def relayout( window ):
+	w = wrapper_of( window )
+	if w: w.relayout()
 
 # Hide sidebars in new windows:
 class Listener( EventListener ):
-	# Non-fake toggle_side_bar: Suspend tracking for this window!
 	def on_window_command( self, window, name, args ):
-		if name == 'toggle_side_bar' and args != ID:
-			wrapper( window.id() ).toggle_suspended()
+		if name != 'toggle_side_bar': return
+		w = wrapper_of( window )
+		if not w: return
+
+		# Own and user toggles alike flip the cached visibility:
+		w.sidebar_toggled()
+
+		# Non-fake toggle_side_bar: Suspend tracking for this window!
+		if args != ID:
+			w.toggle_suspended()
+			w.relayout()
+
+	# Layout changed => boundaries changed, maybe sidebar visibility too:
+	def on_post_window_command( self, window, name, args ):
+		w = wrapper_of( window )
+		if not w: return
+		if name in RESYNC_COMMANDS: w.sidebar = None
+		if name in LAYOUT_COMMANDS or name in RESYNC_COMMANDS: w.relayout()
+
+	# A (new) project was loaded into window, sidebar visibility unknown,
+	# its settings overrides may differ:
+	def on_post_load_project( self, window ):
+		w = wrapper_of( window )
+		if not w: return
+		w.sidebar = None
+		w.configure()
+		w.relayout()
+
+	def on_activated( self, view ): relayout( view.window() )
 
 	# Wait: last on_load in sequence => make or get wrapper and hide/show it.
 	def on_load( self, view ):
+		global CONFIG
 		w = view.window()
-		c = on_load_counter( w.id() )
-		c.inc()
-
-		# Handle on_load, get the appropriate wrapper or make one:
-		set_timeout_async( lambda: not c.dec() and
-			wrapper_or_register( w ).hide_or_show(), 0 )
+		if w: loads.poke( w.id(), CONFIG.on_load_quiet_ms, w )
+
+# Dumps a snapshot of the stats into a new scratch view:
+class AutohideSidebarStatsCommand( WindowCommand ):
+	def run( self ):
+		global STATS
+		text = (json.dumps( STATS.snapshot(), indent = 2 ) if STATS
+				else 'Stats are disabled, see "stats_enabled".')
+		view = self.window.new_file()
+		view.set_name( "Autohide Sidebar: Stats" )
+		view.set_scratch( True )
+		view.run_command( 'append', {'characters': text} )
+
+# Periodically writes the stats as JSON to "stats_json_path", if set:
+def dump_stats():
+	global STATS, CONFIG
+	path = CONFIG.stats_json_path
+	if not (STATS and path): return
+	STATS.dump( expanduser( path ) )
+	set_timeout_async( dump_stats, int( CONFIG.stats_interval_s * 1000 ) )
+
+# A Recorder of pointer traces if "record_trace_path" is set:
+def recorder():
+	global CONFIG
+	path = CONFIG.record_trace_path
+	if not path: return
+	return Recorder( expanduser( path ), CONFIG.record_buffer_events )
 
 def plugin_loaded():
 	print( "pre-load-settings")
 	# Load settings:
-	global settings
+	global settings, CONFIG
 	settings = load_settings( 'sublime-autohide-sidebar.sublime-settings' )
+	settings.add_on_change( ID, settings_changed )
+	CONFIG = c = Config.load( settings )
 	print( "post-load-settings" )
 
 	# Hide ALL sidebars:
-	global D, T
-	D = Driver()
+	global D, T, STATS
+	D = Driver( coordinates = c.coordinates_backend )
+	STATS = Stats( D.round_trips ) if c.stats_enabled else None
 	reset_wrappers()
-	for w in windows(): register_new( w )
-
-	# Start receiving events:
-	def move( _id, x, y ): wrapper( _id ).move( x )
-	def leave( _id ): wrapper( _id ).leave()
-	T = D.tracker( move, leave )
+	register_all( windows() )
+
+	# Start receiving events, handled on sublime's thread:
+	Q = Dispatcher( set_timeout, dispatched,
+		c.dispatch_queue_size, dropped, moved_window )
+	def move( _id, x, y ): Q.push( (_id, x, monotonic()) )
+	def leave( _id ): Q.push( (_id, None, monotonic()) )
+	def resize( _id ):
+		w = wrappers.get( _id )
+		if w: set_timeout( w.recompute, 0 )
+	T = D.tracker( move, leave, resize,
+		batch = c.batch_events,
+		max_rate = c.max_event_rate,
+		backend = c.tracking_backend,
+		poll_curve = (c.poll_min_interval_ms, c.poll_max_interval_ms,
+					  c.poll_near_px, c.poll_far_px),
+		sensor_width = c.edge_sensor_width,
+		stats = STATS,
+		recorder = recorder() )
 	T.start()
+	dump_stats()
 	print( "post-T.start()")
 
 def plugin_unloaded():
 	print("stop#1")
 	# Stop receiving events:
-	global D, T
+	global D, T, STATS, settings
+	settings.clear_on_change( ID )
+	STATS = None
+	WHEEL.clear()
 	T.stopx()
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from bisect import bisect_left
+from time import perf_counter, monotonic
+import json
+
+#
+# Hot path instrumentation: counters & fixed bucket latency histograms.
+# Each counter is only ever written by one thread (the tracker thread or
+# sublime's), so plain integer increments suffice: no locks on the hot path.
+#
+
+# Upper bounds of histogram buckets in microseconds, the last is overflow:
+BUCKETS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500,
+			  1000, 2000, 5000, 10000, 50000, 100000)
+
+class Histogram( object ):
+	__slots__ = ('counts', 'total_us')
+
+	def __init__( self ):
+		self.counts = [0] * (len( BUCKETS_US ) + 1)
+		self.total_us = 0
+
+	# Adds a duration in seconds, as from perf_counter():
+	def add( self, seconds ):
+		us = seconds * 1e6
+		self.counts[bisect_left( BUCKETS_US, us )] += 1
+		self.total_us += us
+
+	def snapshot( self ):
+		n = sum( self.counts )
+		bounds = [str( b ) for b in BUCKETS_US] + ["inf"]
+		return {
+			"count": n,
+			"mean_us": self.total_us / n if n else 0,
+			"buckets_us": {b: c for b, c in zip( bounds, self.counts ) if c},
+		}
+
+# Stages of the pipeline that are timed:
+STAGES = ('event', 'lookup', 'predicate', 'toggle')
+
+# Counters & histograms of one window:
+class WindowStats( object ):
+	COUNTERS = ('events', 'coalesced', 'dropped', 'lookup_misses',
+				'predicates', 'toggles')
+
+	def __init__( self ):
+		for c in self.COUNTERS: setattr( self, c, 0 )
+		self.hist = {s: Histogram() for s in STAGES}
+
+	def time( self, stage, t0 ): self.hist[stage].add( perf_counter() - t0 )
+
+	def snapshot( self ):
+		r = {c: getattr( self, c ) for c in self.COUNTERS}
+		r["latency"] = {s: h.snapshot() for s, h in self.hist.items()}
+		return r
+
+class Stats( object ):
+	def __init__( self, round_trips = lambda: 0 ):
+		self.started = monotonic()
+		self.windows = {}
+		self.round_trips = round_trips
+
+	def window( self, _id ):
+		w = self.windows.get( _id )
+		if w is None: w = self.windows[_id] = WindowStats()
+		return w
+
+	def snapshot( self ):
+		uptime = monotonic() - self.started
+		minutes = max( uptime, 1 ) / 60
+		windows = {str( _id ): w.snapshot()
+				   for _id, w in list( self.windows.items() )}
+		events = sum( w["events"] for w in windows.values() )
+		toggles = sum( w["toggles"] for w in windows.values() )
+		rt = self.round_trips()
+		return {
+			"uptime_s": uptime,
+			"events": events,
+			"coalesced": sum( w["coalesced"] for w in windows.values() ),
+			"dropped": sum( w["dropped"] for w in windows.values() ),
+			"toggles": toggles,
+			"toggles_per_minute": toggles / minutes,
+			"round_trips": rt,
+			"round_trips_per_event": rt / events if events else 0,
+			"windows": windows,
+		}
+
+	def dump( self, path ):
+		with open( path, 'w' ) as f:
+			json.dump( self.snapshot(), f, indent = 2 )
@@ -0,0 +1,89 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Unit tests of config.py: settings snapshots & per project overrides.
+#
+import io, os, sys, unittest
+from contextlib import redirect_stdout
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+if ROOT not in sys.path: sys.path.insert( 0, ROOT )
+
+from config import Config, KEYS, WINDOW_KEYS, project_overrides
+
+class Settings( dict ):
+	pass
+
+class Window( object ):
+	def __init__( self, data ): self.data = data
+	def project_data( self ): return self.data
+
+class ConfigTest( unittest.TestCase ):
+	def setUp( self ):
+		self.c = Config.load( Settings( hide_show_padding_x = 25,
+			show_delay_ms = 0, tracking_backend = 'core' ) )
+
+	def test_load( self ):
+		self.assertEqual( self.c.hide_show_padding_x, 25 )
+		self.assertEqual( self.c.tracking_backend, 'core' )
+		self.assertIsNone( self.c.hide_delay_ms )
+
+	def test_immutable( self ):
+		with self.assertRaises( AttributeError ):
+			self.c.show_delay_ms = 100
+		with self.assertRaises( AttributeError ):
+			self.c.unknown = 1
+		self.assertEqual( self.c.show_delay_ms, 0 )
+
+	# The snapshot overridden is left as is:
+	def test_override_merge( self ):
+		o = self.c.override( {'hide_show_padding_x': 40, 'show_delay_ms': 80} )
+		self.assertEqual( (o.hide_show_padding_x, o.show_delay_ms), (40, 80) )
+		self.assertEqual( o.tracking_backend, 'core' )
+		self.assertEqual( self.c.hide_show_padding_x, 25 )
+		self.assertIs( self.c.override( None ), self.c )
+		self.assertIs( self.c.override( {} ), self.c )
+
+	# Tracker & global keys are not per window: ignored, with a warning:
+	def test_override_rejects_global_keys( self ):
+		out = io.StringIO()
+		with redirect_stdout( out ):
+			o = self.c.override( {'tracking_backend': 'poll',
+				'batch_events': False, 'nonsense': 1, 'dwell_velocity': 900} )
+		self.assertEqual( o.tracking_backend, 'core' )
+		self.assertIsNone( o.batch_events )
+		self.assertEqual( o.dwell_velocity, 900 )
+		self.assertIn( "batch_events, nonsense, tracking_backend",
+					   out.getvalue() )
+
+	def test_window_keys_known( self ):
+		self.assertTrue( set( WINDOW_KEYS ) <= set( KEYS ) )
+
+	def test_project_overrides( self ):
+		overrides = {'hide_show_padding_x': 40}
+		self.assertEqual( project_overrides( Window( {'settings':
+			{'autohide_sidebar': overrides}} ) ), overrides )
+		self.assertIsNone( project_overrides( Window( None ) ) )
+		self.assertIsNone( project_overrides( Window( {'settings': None} ) ) )
+
+if __name__ == "__main__": unittest.main()
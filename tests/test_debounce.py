@@ -0,0 +1,94 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Unit tests of debounce.py on a virtual clock.
+#
+import os, sys, unittest
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+if ROOT not in sys.path: sys.path.insert( 0, ROOT )
+
+from debounce import Debouncer
+
+class DebouncerTest( unittest.TestCase ):
+	def setUp( self ):
+		self.now = 0
+		self.pending = []
+		self.scheduled = 0
+		self.fired = []
+		self.d = Debouncer( self.schedule,
+			lambda *args: self.fired.append( (self.now,) + args ) )
+
+	def schedule( self, fn, delay_ms ):
+		self.scheduled += 1
+		self.pending.append( (self.now + delay_ms, fn) )
+		self.pending.sort( key = lambda p: p[0] )
+
+	def advance( self, ms ):
+		while self.pending and self.pending[0][0] <= ms:
+			self.now, fn = self.pending.pop( 0 )
+			fn()
+		self.now = ms
+
+	def test_fires_after_quiet( self ):
+		self.d.poke( 'a', 100, 1 )
+		self.advance( 99 )
+		self.assertEqual( self.fired, [] )
+		self.advance( 100 )
+		self.assertEqual( self.fired, [(100, 1)] )
+
+	# A poke during the wait re-arms once it elapsed, with the latest args:
+	def test_rearm_after_poke( self ):
+		self.d.poke( 'a', 100, 1 )
+		self.advance( 50 )
+		self.d.poke( 'a', 100, 2 )
+		self.advance( 100 )
+		self.assertEqual( self.fired, [] )
+		self.advance( 200 )
+		self.assertEqual( self.fired, [(200, 2)] )
+		self.assertEqual( self.pending, [] )
+
+	# A storm costs one timer per quiet period, not one per poke:
+	def test_storm( self ):
+		for t in range( 100 ):
+			self.advance( t )
+			self.d.poke( 'a', 100, t )
+		self.advance( 1000 )
+		self.assertEqual( self.fired, [(200, 99)] )
+		self.assertEqual( self.scheduled, 2 )
+
+	def test_keys_independent( self ):
+		self.d.poke( 'a', 100, 1 )
+		self.d.poke( 'b', 50, 2 )
+		self.advance( 1000 )
+		self.assertEqual( self.fired, [(50, 2), (100, 1)] )
+
+	# After firing, a key starts over:
+	def test_poke_after_fire( self ):
+		self.d.poke( 'a', 100, 1 )
+		self.advance( 100 )
+		self.d.poke( 'a', 100, 2 )
+		self.advance( 200 )
+		self.assertEqual( self.fired, [(100, 1), (200, 2)] )
+
+if __name__ == "__main__": unittest.main()
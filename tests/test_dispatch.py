@@ -0,0 +1,95 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Unit tests of dispatch.py: batching, dropping & collapsing.
+#
+import os, sys, unittest
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+if ROOT not in sys.path: sys.path.insert( 0, ROOT )
+
+from dispatch import Dispatcher
+
+# Items as main.py pushes them: (_id, x) moves, (_id, None) leaves:
+def window( item ): return item[0] if item[1] is not None else None
+
+class DispatcherTest( unittest.TestCase ):
+	def setUp( self ):
+		self.scheduled = []
+		self.handled = []
+		self.dropped = []
+
+	def dispatcher( self, capacity, key = window ):
+		return Dispatcher( lambda fn, ms: self.scheduled.append( fn ),
+			self.handled.append, capacity, self.dropped.append, key )
+
+	def drain( self ):
+		for fn in self.scheduled: fn()
+		del self.scheduled[:]
+
+	# One drain per burst, items in order:
+	def test_batches( self ):
+		q = self.dispatcher( 8 )
+		for x in range( 3 ): q.push( (1, x) )
+		self.assertEqual( len( self.scheduled ), 1 )
+		self.drain()
+		self.assertEqual( self.handled, [[(1, 0), (1, 1), (1, 2)]] )
+		q.push( (1, 3) )
+		self.drain()
+		self.assertEqual( self.handled[1], [(1, 3)] )
+
+	# Without key, the oldest item is dropped & reported:
+	def test_drop_oldest( self ):
+		q = self.dispatcher( 2, key = None )
+		for x in range( 3 ): q.push( (1, x) )
+		self.assertEqual( self.dropped, [(1, 0)] )
+		self.drain()
+		self.assertEqual( self.handled, [[(1, 1), (1, 2)]] )
+
+	# Full: all but the latest move per window go, leaves stay in order:
+	def test_collapse_moves( self ):
+		q = self.dispatcher( 5 )
+		for item in [(1, 0), (2, 0), (1, None), (1, 1), (2, 1), (1, 2)]:
+			q.push( item )
+		self.assertEqual( self.dropped, [(1, 0), (2, 0)] )
+		self.drain()
+		self.assertEqual( self.handled,
+			[[(1, None), (1, 1), (2, 1), (1, 2)]] )
+
+	# Nothing superseded: the oldest move goes, never a leave:
+	def test_drop_oldest_move( self ):
+		q = self.dispatcher( 3 )
+		for item in [(1, None), (2, 0), (3, 0), (4, 0)]: q.push( item )
+		self.assertEqual( self.dropped, [(2, 0)] )
+		self.drain()
+		self.assertEqual( self.handled, [[(1, None), (3, 0), (4, 0)]] )
+
+	# Only leaves: the queue grows past capacity, nothing is lost:
+	def test_keeps_leaves( self ):
+		q = self.dispatcher( 2 )
+		for _id in range( 4 ): q.push( (_id, None) )
+		self.assertEqual( self.dropped, [] )
+		self.drain()
+		self.assertEqual( len( self.handled[0] ), 4 )
+
+if __name__ == "__main__": unittest.main()
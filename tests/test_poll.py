@@ -0,0 +1,137 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Unit tests of the poll backend, driver/poll.py, and a run against Xvfb.
+#
+import os, sys, unittest
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+if ROOT not in sys.path: sys.path.insert( 0, ROOT )
+
+from xserver import XvfbCase, Probe
+from driver.base import WindowIndex
+from driver.poll import PollMoveEvent, poll_interval, BACKOFF_MAX
+
+CURVE = (8, 250, 32, 400)
+FRAME, CLIENT = 0x100, 0x200
+
+class IntervalTest( unittest.TestCase ):
+	def test_endpoints( self ):
+		self.assertEqual( poll_interval( CURVE, 0 ), 0.008 )
+		self.assertEqual( poll_interval( CURVE, 32 ), 0.008 )
+		self.assertEqual( poll_interval( CURVE, 400 ), 0.25 )
+		self.assertEqual( poll_interval( CURVE, 10000 ), 0.25 )
+
+	def test_linear_between( self ):
+		mid = poll_interval( CURVE, (32 + 400) / 2 )
+		self.assertAlmostEqual( mid, (0.008 + 0.25) / 2 )
+
+# Client 1 at root (100, 0) 800x600, with the pointer at .pointer:
+class FakeRoot( object ):
+	def __init__( self ): self.pointer = (1000, 10, 0)
+	def pointer_child( self ): return self.pointer
+
+class FakeDriver( object ):
+	def __init__( self ):
+		self.root = FakeRoot()
+		self.frames = {FRAME: CLIENT}
+		self.win_map = WindowIndex()
+		self.win_map.bind( CLIENT, 1 )
+		self.edges = {}
+
+	def geometry( self, handle ): return (100, 0, 800, 600)
+
+class PollTest( unittest.TestCase ):
+	def setUp( self ):
+		self.probe = Probe()
+		self.waits = []
+		T = self.T = PollMoveEvent.__new__( PollMoveEvent )
+		T.driver = self.D = FakeDriver()
+		T.move, T.leave = self.probe.move, self.probe.leave
+		T.call_later = lambda delay, fn: self.waits.append( delay )
+		T.alive, T.stats, T.hovered = True, None, None
+		T.curve, T.last, T.backoff = CURVE, None, 1
+
+	def poll( self, x = None, y = 10, child = FRAME ):
+		if x is not None: self.D.root.pointer = (x, y, child)
+		self.T._poll()
+		return self.waits[-1]
+
+	# Far from every window: the slowest rate, which also caps backoff:
+	def test_far( self ):
+		self.assertEqual( self.poll( 1000, child = 0 ), 0.25 )
+		self.assertEqual( self.poll(), 0.25 )
+
+	# A resting pointer backs off, doubling up to BACKOFF_MAX times:
+	def test_backoff( self ):
+		near = poll_interval( CURVE, 0 )
+		self.assertEqual( self.poll( 100 ), near )
+		waits = [self.poll() for _ in range( 6 )]
+		self.assertEqual( waits, [near * 2, near * 4, near * 8,
+			near * BACKOFF_MAX, near * BACKOFF_MAX, near * BACKOFF_MAX] )
+
+	def test_backoff_resets_on_move( self ):
+		for _ in range( 5 ): self.poll( 100 )
+		self.assertEqual( self.T.backoff, BACKOFF_MAX )
+		self.assertEqual( self.poll( 101 ), poll_interval( CURVE, 1 ) )
+		self.assertEqual( self.T.backoff, 1 )
+
+	def test_routes_moves_and_leaves( self ):
+		self.poll( 110, 20 )
+		self.poll( 1000, 20, 0 )
+		self.assertEqual( self.probe.moves, [(1, 10, 20)] )
+		self.assertEqual( self.probe.leaves, [1] )
+
+	# Without edges: distance to the left edge of the window:
+	def test_distance_left_edge( self ):
+		self.assertEqual( self.T._distance( 100, 10 ), 0 )
+		self.assertEqual( self.T._distance( 150, 10 ), 50 )
+
+	# Hidden: distance to show_x, the hide boundary is irrelevant:
+	def test_distance_hidden( self ):
+		self.D.edges[CLIENT] = (20, 300, False)
+		self.assertEqual( self.T._distance( 120, 10 ), 0 )
+		self.assertEqual( self.T._distance( 400, 10 ), 280 )
+
+	# Shown: distance to hide_x, the show boundary is irrelevant:
+	def test_distance_shown( self ):
+		self.D.edges[CLIENT] = (20, 300, True)
+		self.assertEqual( self.T._distance( 400, 10 ), 0 )
+		self.assertEqual( self.T._distance( 120, 10 ), 280 )
+
+	# Above / below the window counts too:
+	def test_distance_vertical( self ):
+		self.D.edges[CLIENT] = (20, 300, False)
+		self.assertEqual( self.T._distance( 120, 700 ), 100 )
+
+class PollXvfbTest( XvfbCase ):
+	def test_move_leave( self ):
+		self.assertIsInstance( self.track( 'poll' ), PollMoveEvent )
+		self.start()
+		self.hover( 0, 10, 300 )
+		self.assertTrue( self.probe.until(
+			lambda: (1, 10, 300) in self.probe.moves ) )
+		self.away()
+		self.assertTrue( self.probe.until( lambda: 1 in self.probe.leaves ) )
+
+if __name__ == "__main__": unittest.main()
@@ -0,0 +1,76 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Unit tests of driver/record.py: recording & reading back traces.
+#
+import os, sys, time, shutil, tempfile, unittest
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+if ROOT not in sys.path: sys.path.insert( 0, ROOT )
+
+from driver.record import Recorder, read_trace, MOVE, LEAVE
+
+class RecordTest( unittest.TestCase ):
+	def setUp( self ):
+		self.dir = tempfile.mkdtemp()
+		self.path = os.path.join( self.dir, "trace.bin" )
+
+	def tearDown( self ): shutil.rmtree( self.dir )
+
+	def record( self, events, capacity = 4 ):
+		r = Recorder( self.path, capacity )
+		move, leave = r.hooks( lambda *a: None, lambda *a: None )
+		for e in events:
+			if e[1] is None: leave( e[0] )
+			else: move( *e )
+		r.flush()
+
+	def test_round_trip( self ):
+		self.record( [(7, 10, 20), (7, 11, 21), (7, None), (9, -5, 0),
+					  (None, 1, 1)] )
+		records = list( read_trace( self.path ) )
+		self.assertEqual( [r[1:] for r in records],
+			[(7, 10, 20, MOVE), (7, 11, 21, MOVE), (7, 0, 0, LEAVE),
+			 (9, -5, 0, MOVE)] )
+		ts = [r[0] for r in records]
+		self.assertEqual( ts, sorted( ts ) )
+
+	# A second session appends records after the first, with one header:
+	def test_appended_sessions( self ):
+		self.record( [(1, i, 0) for i in range( 6 )] )
+		time.sleep( 0.01 )
+		self.record( [(2, i, 0) for i in range( 6 )] )
+		records = list( read_trace( self.path ) )
+		self.assertEqual( [r[1] for r in records], [1] * 6 + [2] * 6 )
+		ts = [r[0] for r in records]
+		self.assertEqual( ts, sorted( ts ) )
+		self.assertGreater( ts[6] - ts[5], 0.005 )
+		self.assertLess( abs( ts[0] - time.time() ), 60 )
+
+	def test_empty_and_foreign( self ):
+		open( self.path, "wb" ).close()
+		self.assertEqual( list( read_trace( self.path ) ), [] )
+		with open( self.path, "wb" ) as f: f.write( b"not a trace file" )
+		with self.assertRaises( ValueError ): list( read_trace( self.path ) )
+
+if __name__ == "__main__": unittest.main()
@@ -0,0 +1,69 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# The edge sensor backend, driver/sensors.py, against Xvfb.
+#
+import unittest
+from xserver import XvfbCase
+
+SHOW_X, HIDE_X = 20, 300
+
+class SensorsTest( XvfbCase ):
+	def setUp( self ):
+		super().setUp()
+		self.track( 'sensors' )
+		self.D.set_edges( 1, SHOW_X, HIDE_X, False )
+		self.start()
+
+	def moved( self, x, y ):
+		return self.probe.until( lambda: (1, x, y) in self.probe.moves )
+
+	# Hidden: only the show sensor is mapped, entering it is a move:
+	def test_enter_show_sensor( self ):
+		show, hide = self.D.sensors.pairs[self.standins.windows[0][0]]
+		self.assertEqual( self.D.sensors.placed[show],
+						  (0, SHOW_X, 600, True) )
+		self.assertIsNone( self.D.sensors.placed[hide] )
+
+		self.hover( 0, 5, 300 )
+		self.assertTrue( self.moved( 5, 300 ) )
+		self.away()
+		self.assertTrue( self.probe.until( lambda: 1 in self.probe.leaves ) )
+
+	# Shown: the sensors swap, crossings of hide_x are moves:
+	def test_enter_hide_sensor( self ):
+		self.D.set_edges( 1, SHOW_X, HIDE_X, True )
+		self.hover( 0, 5, 300 )
+		self.hover( 0, HIDE_X + 10, 300 )
+		self.assertTrue( self.moved( HIDE_X + 10, 300 ) )
+		self.assertNotIn( (1, 5, 300), self.probe.moves )
+
+	# Leaving the show sensor inward is a move where it was left:
+	def test_leave_sensor( self ):
+		self.hover( 0, 5, 300 )
+		self.assertTrue( self.moved( 5, 300 ) )
+		self.hover( 0, 100, 300 )
+		self.assertTrue( self.moved( 100, 300 ) )
+
+if __name__ == "__main__": unittest.main()
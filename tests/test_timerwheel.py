@@ -0,0 +1,108 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Unit tests of timerwheel.py on a virtual clock.
+# Kept out of the package root: sublime loads every module there.
+#
+# Usage: python -m unittest discover tests, or: python -m pytest tests
+#
+import os, sys, unittest
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+if ROOT not in sys.path: sys.path.insert( 0, ROOT )
+
+import timerwheel
+from timerwheel import TimerWheel
+
+class WheelTest( unittest.TestCase ):
+	def setUp( self ):
+		self.now = 0
+		self.pending = []
+		self.monotonic = timerwheel.monotonic
+		timerwheel.monotonic = lambda: self.now / 1000
+		self.wheel = TimerWheel( self.schedule, tick_ms = 10, slots = 4 )
+
+	def tearDown( self ):
+		timerwheel.monotonic = self.monotonic
+
+	def schedule( self, fn, delay_ms ):
+		self.pending.append( (self.now + delay_ms, fn) )
+
+	# Runs the tick chain up to ms:
+	def advance( self, ms ):
+		while self.pending and self.pending[0][0] <= ms:
+			self.now, fn = self.pending.pop( 0 )
+			fn()
+		self.now = ms
+
+	def test_fires_after_delay( self ):
+		fired = []
+		self.wheel.add( 25, lambda: fired.append( self.now ) )
+		self.advance( 20 )
+		self.assertEqual( fired, [] )
+		self.advance( 30 )
+		self.assertEqual( fired, [30] )
+		self.assertEqual( self.wheel.count, 0 )
+		self.assertEqual( self.pending, [] )
+
+	# Delays beyond one revolution wait for their rounds:
+	def test_rounds( self ):
+		fired = []
+		self.wheel.add( 100, lambda: fired.append( self.now ) )
+		self.advance( 90 )
+		self.assertEqual( fired, [] )
+		self.advance( 100 )
+		self.assertEqual( fired, [100] )
+
+	def test_cancel( self ):
+		fired = []
+		t = self.wheel.add( 10, lambda: fired.append( 1 ) )
+		self.wheel.cancel( t )
+		self.wheel.cancel( t )
+		self.advance( 50 )
+		self.assertEqual( fired, [] )
+		self.assertEqual( self.wheel.count, 0 )
+
+	# A due callback cancelling another timer due in the same slot:
+	def test_cancel_from_callback( self ):
+		fired = []
+		timers = []
+		def fn( i ):
+			fired.append( i )
+			for t in timers: self.wheel.cancel( t )
+		timers.extend( self.wheel.add( 10, lambda i = i: fn( i ) )
+					   for i in range( 2 ) )
+		self.advance( 10 )
+		self.assertEqual( len( fired ), 1 )
+		self.assertEqual( self.wheel.count, 0 )
+
+	# A late set_timeout expires all the ticks that elapsed:
+	def test_late_tick( self ):
+		fired = []
+		self.wheel.add( 10, lambda: fired.append( 10 ) )
+		self.wheel.add( 30, lambda: fired.append( 30 ) )
+		self.pending[0] = (35, self.pending[0][1])
+		self.advance( 35 )
+		self.assertEqual( sorted( fired ), [10, 30] )
+
+if __name__ == "__main__": unittest.main()
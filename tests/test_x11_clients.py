@@ -0,0 +1,99 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Unit tests of the X11 driver's client bookkeeping, without a display.
+#
+import os, sys, unittest
+from threading import Lock
+from collections import deque
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+if ROOT not in sys.path: sys.path.insert( 0, ROOT )
+
+import driver.X11 as x11
+from xserver import XvfbCase
+
+# A Driver without a display, classifying with is_sublime( handle ):
+def driver( is_sublime ):
+	class Classifier( x11.Classifier ):
+		def __call__( self, w ): return is_sublime( w.win )
+
+	D = x11.Driver.__new__( x11.Driver )
+	x11.DriverMeta.__init__( D )
+	D.disp = None
+	D.is_sublime = Classifier()
+	D.clients, D.clients_lock = set(), Lock()
+	D.fresh, D.unbound = deque(), []
+	D.frames, D.frame_of, D.index_lock = {}, {}, Lock()
+	D.geoms, D.inside, D.focused, D.masks, D.edges = {}, set(), set(), {}, {}
+	D.sensors = None
+	return D
+
+class CandidatesTest( unittest.TestCase ):
+	def test_classifies_fresh( self ):
+		D = driver( lambda h: h % 2 == 0 )
+		D.clients.update( range( 1, 7 ) )
+		D.fresh.extend( range( 1, 7 ) )
+		self.assertEqual( D._candidates(), [2, 4, 6] )
+		self.assertEqual( len( D.fresh ), 0 )
+
+	# A client failing to classify does not drop the ones after it:
+	def test_failing_client( self ):
+		def is_sublime( h ):
+			if h == 1: raise NameError( "win" )
+			return True
+		D = driver( is_sublime )
+		D.clients.update( (1, 2, 3) )
+		D.fresh.extend( (1, 2, 3) )
+		self.assertEqual( D._candidates(), [2, 3] )
+
+	def test_bound_and_gone_are_no_candidates( self ):
+		D = driver( lambda h: True )
+		D.clients.update( (1, 2) )
+		D.fresh.extend( (1, 2) )
+		D.win_map.bind( 1, 10 )
+		self.assertEqual( D._candidates(), [2] )
+		D.clients.discard( 2 )
+		self.assertEqual( D._candidates(), [] )
+
+class FramesTest( unittest.TestCase ):
+	def test_set_frame_and_gone( self ):
+		D = driver( lambda h: True )
+		D.win_map.bind( 1, 10 )
+		D._set_frame( 1, 100 )
+		D._set_frame( 1, 200 )
+		self.assertEqual( D.frames, {200: 1} )
+		self.assertEqual( D.frame_of, {1: 200} )
+		D._gone( 1 )
+		self.assertEqual( (D.frames, D.frame_of), ({}, {}) )
+		self.assertFalse( D.win_map.has_id( 10 ) )
+
+# Titles of the stand-ins, set as WM_NAME (STRING):
+class TitleTest( XvfbCase ):
+	def test_title( self ):
+		win = self.standins.windows[0][0]
+		w = self.X11.XWindow( self.D.disp, win )
+		self.assertEqual( w.title(), "bench 0 - Sublime Text" )
+		self.assertTrue( self.X11.is_sublime( w, lambda pid: False ) )
+
+if __name__ == "__main__": unittest.main()
@@ -0,0 +1,94 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# XCB queries falling back to Xlib once the connection broke, without a
+# display: the connection is made to one which does not exist.
+#
+import os, sys, unittest
+from threading import Lock
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+if ROOT not in sys.path: sys.path.insert( 0, ROOT )
+
+import driver.X11 as x11
+from driver.xcb import XCB, XcbQueries
+from xserver import XvfbCase
+
+ROOT_WIN, FRAME, CLIENT = 1, 0x100, 0x200
+
+# The Xlib side: root at (0, 0), the pointer at .at over FRAME:
+class FakeRoot( object ):
+	win = ROOT_WIN
+	at = (130, 70)
+	def pointer( self ): return self.at + (0, 0)
+	def pointer_child( self ): return self.at + (FRAME,)
+
+@unittest.skipUnless( XCB, "needs libxcb" )
+class FallbackTest( unittest.TestCase ):
+	def setUp( self ):
+		conn = XCB.xcb_connect( b":4242", None )
+		self.xcb = XcbQueries( conn, ROOT_WIN )
+		D = self.D = x11.Driver.__new__( x11.Driver )
+		x11.DriverMeta.__init__( D )
+		D.closed, D.wake, D.xcb = False, None, self.xcb
+		D.root = FakeRoot()
+		D.frames, D.frame_of = {FRAME: CLIENT}, {CLIENT: FRAME}
+		D.geoms = {ROOT_WIN: (0, 0, 1920, 1080), CLIENT: (100, 50, 800, 600)}
+		D.win_map.bind( CLIENT, 1 )
+
+	def tearDown( self ): self.xcb.close()
+
+	def test_broken( self ):
+		self.assertTrue( self.xcb.broken() )
+		self.assertIsNone( self.xcb.window_and_pointer( CLIENT ) )
+
+	def test_window_coordinates( self ):
+		self.assertEqual( self.D.window_coordinates( 1 ), (30, 20) )
+		self.assertIsNone( self.D.xcb )
+		self.assertEqual( self.D.window_coordinates( 1 ), (30, 20) )
+
+	def test_pointer_window( self ):
+		self.assertEqual( self.D.pointer_window(), (1, 30, 20) )
+		self.assertIsNone( self.D.xcb )
+
+	# Over the decorations of the frame, left of & above the client:
+	def test_pointer_window_decorations( self ):
+		self.D.root.at = (95, 70)
+		self.assertIsNone( self.D.pointer_window() )
+		self.D.root.at = (130, 45)
+		self.assertIsNone( self.D.pointer_window() )
+
+# One query_pointer over XCB, placed by the geometry cache:
+class XcbXvfbTest( XvfbCase ):
+	def test_pointer_window( self ):
+		D = self.X11.Driver( coordinates = 'xcb' )
+		try:
+			D.register_new_window( 1 )
+			self.assertIsNotNone( D.xcb )
+			self.hover( 0, 30, 40 )
+			self.assertEqual( D.pointer_window(), (1, 30, 40) )
+			self.assertEqual( D.window_coordinates( 1 ), (30, 40) )
+			self.assertIsNotNone( D.xcb )
+		finally: D.close()
+
+if __name__ == "__main__": unittest.main()
@@ -0,0 +1,110 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# The XInput2 raw motion backend against Xvfb, see xserver.py.
+#
+import unittest
+from ctypes import byref
+from xserver import XvfbCase, Probe
+from driver.base import WindowIndex
+from driver.xinput2 import PointerMoveEvent
+
+FRAME, CLIENT = 0x100, 0x200
+
+# Client 1 at root (100, 50), reparented into FRAME:
+class FakeDriver( object ):
+	def __init__( self ):
+		self.frames = {FRAME: CLIENT}
+		self.win_map = WindowIndex()
+		self.win_map.bind( CLIENT, 1 )
+
+	def geometry( self, handle ): return (100, 50, 800, 600)
+
+class RouteTest( unittest.TestCase ):
+	def setUp( self ):
+		self.probe = Probe()
+		self.T = PointerMoveEvent.__new__( PointerMoveEvent )
+		self.T.driver = FakeDriver()
+		self.T.move, self.T.leave = self.probe.move, self.probe.leave
+		self.T.stats = None
+		self.T.hovered = None
+
+	def test_local_coordinates( self ):
+		self.T._route( 1, 110, 60, FRAME )
+		self.assertEqual( self.probe.moves, [(1, 10, 10)] )
+
+	# The left border & title bar of the frame are not in the client:
+	def test_decorations_leave( self ):
+		self.T._route( 1, 110, 60, FRAME )
+		self.T._route( 1, 97, 60, FRAME )
+		self.T._route( 1, 110, 40, FRAME )
+		self.assertEqual( self.probe.moves, [(1, 10, 10)] )
+		self.assertEqual( self.probe.leaves, [1] )
+
+	def test_other_window_leaves( self ):
+		self.T._route( 1, 110, 60, FRAME )
+		self.T._route( 1, 110, 60, 0x300 )
+		self.assertEqual( self.probe.leaves, [1] )
+
+class XInput2Test( XvfbCase ):
+	def test_opcode( self ):
+		from driver.xinput2 import xinput2_opcode
+		opcode = xinput2_opcode( self.D.disp )
+		self.assertIsInstance( opcode, int )
+		self.assertGreater( opcode, 0 )
+
+	# Raw motion is selected on root & reaches the display:
+	def test_select_raw_motion( self ):
+		from driver.xinput2 import (xinput2_opcode, select_raw_motion,
+									XI_RawMotion)
+		X, disp = self.X11.X11, self.D.disp
+		opcode = xinput2_opcode( disp )
+		select_raw_motion( disp, self.D.root.win )
+		self.hover( 0, 100, 100 )
+		self.hover( 0, 120, 110 )
+
+		e = self.X11.XEvent()
+		raw = False
+		for _ in range( 100 ):
+			X.XSync( disp, 0 )
+			while X.XPending( disp ):
+				X.XNextEvent( disp, byref( e ) )
+				c = e.xcookie
+				raw = raw or (e.type == self.X11.GenericEvent and
+					c.extension == opcode and c.evtype == XI_RawMotion)
+			if raw: break
+			self.hover( 0, 100 + _, 100 )
+		self.assertTrue( raw )
+
+	def test_move_leave( self ):
+		from driver.xinput2 import RawMoveEvent
+		self.assertIsInstance( self.track( 'xinput2' ), RawMoveEvent )
+		self.start()
+		self.hover( 0, 10, 300 )
+		self.assertTrue( self.probe.until(
+			lambda: (1, 10, 300) in self.probe.moves ) )
+		self.away()
+		self.assertTrue( self.probe.until( lambda: 1 in self.probe.leaves ) )
+
+if __name__ == "__main__": unittest.main()
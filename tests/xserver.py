@@ -0,0 +1,105 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Test cases against a headless X server: Xvfb with stand-in sublime
+# windows & XTest pointer injection, see bench/xvfb.py. Skipped where
+# Xvfb or libXtst are missing.
+#
+import os, sys, time, shutil, unittest
+from ctypes.util import find_library
+from threading import Event
+
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+for path in (ROOT, os.path.join( ROOT, "bench" )):
+	if path not in sys.path: sys.path.insert( 0, path )
+
+HAVE_XVFB = bool( shutil.which( "Xvfb" ) and find_library( "Xtst" ) )
+
+# Records what a tracker calls back with:
+class Probe( object ):
+	def __init__( self ):
+		self.moves = []
+		self.leaves = []
+		self.event = Event()
+
+	def move( self, _id, x, y ):
+		self.moves.append( (_id, x, y) )
+		self.event.set()
+
+	def leave( self, _id ):
+		self.leaves.append( _id )
+		self.event.set()
+
+	# Waits until pred() holds, returns its last value:
+	def until( self, pred, timeout = 2.0 ):
+		end = time.monotonic() + timeout
+		while not pred() and time.monotonic() < end:
+			self.event.wait( 0.05 )
+			self.event.clear()
+		return pred()
+
+@unittest.skipUnless( HAVE_XVFB, "needs Xvfb & libXtst" )
+class XvfbCase( unittest.TestCase ):
+	windows = 1
+
+	@classmethod
+	def setUpClass( cls ):
+		from xvfb import start_xvfb, x11_driver, StandIns, Pointer
+		cls.xvfb = start_xvfb()
+		cls.X11 = x11_driver()
+		cls.standins = StandIns( cls.X11, cls.windows )
+		cls.pointer = Pointer( cls.X11 )
+
+	@classmethod
+	def tearDownClass( cls ):
+		cls.pointer.close()
+		cls.standins.close()
+		cls.xvfb.terminate()
+		cls.xvfb.wait()
+
+	def setUp( self ):
+		self.pointer.move( *self.standins.outside() )
+		self.D = self.X11.Driver()
+		for _id in range( 1, self.windows + 1 ):
+			self.D.register_new_window( _id )
+		self.probe = Probe()
+		self.T = None
+
+	def tearDown( self ):
+		if self.T: self.T.stopx()
+		else: self.D.close()
+
+	# Starts a tracker of backend, calling back the probe:
+	def track( self, backend, **opts ):
+		self.T = self.D.tracker( self.probe.move, self.probe.leave,
+								 backend = backend, **opts )
+		return self.T
+
+	def start( self ):
+		self.T.start()
+		time.sleep( 0.2 )
+
+	# Moves the pointer to (x, y) local to stand-in i, or outside of all:
+	def hover( self, i, x, y ): self.pointer.move( *self.standins.at( i, x, y ) )
+	def away( self ): self.pointer.move( *self.standins.outside() )
@@ -0,0 +1,93 @@
+"""
+Autohide Sidebar
+or: sublime-autohide-sidebar
+
+A Sublime Text plugin that autohides the sidebar and shows
+it when the mouse hovers the edge of the editors window.
+
+Copyright (C) 2015, Mazdak Farrokhzad
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from time import monotonic
+
+#
+# A hashed timer wheel: one ticking set_timeout chain shared by all timers,
+# running only while any timer is pending. Adding & cancelling is O(1).
+# Single threaded: use it from the thread schedule() calls back on.
+#
+
+class Timer( object ):
+	__slots__ = ('fn', 'rounds', 'slot')
+
+	def __init__( self, fn, rounds, slot ):
+		self.fn = fn
+		self.rounds = rounds
+		self.slot = slot
+
+class TimerWheel( object ):
+	# schedule( callback, delay_ms ), e.g: sublime.set_timeout:
+	def __init__( self, schedule, tick_ms = 10, slots = 64 ):
+		self.schedule = schedule
+		self.tick_ms = tick_ms
+		self.slots = [set() for _ in range( slots )]
+		self.cursor = 0
+		self.count = 0
+		self.last = None
+
+	# Runs fn in delay_ms (rounded up to ticks), returns a Timer handle:
+	def add( self, delay_ms, fn ):
+		n = len( self.slots )
+		ticks = max( 1, -(-int( delay_ms ) // self.tick_ms) )
+		t = Timer( fn, (ticks - 1) // n, (self.cursor + ticks) % n )
+		self.slots[t.slot].add( t )
+		self.count += 1
+		if self.last is None:
+			self.last = monotonic()
+			self.schedule( self._tick, self.tick_ms )
+		return t
+
+	def cancel( self, t ):
+		slot = self.slots[t.slot]
+		if t in slot:
+			slot.remove( t )
+			self.count -= 1
+
+	# Drops all pending timers, e.g: on unload:
+	def clear( self ):
+		for slot in self.slots: slot.clear()
+		self.count = 0
+
+	# Advances by the ticks that elapsed, set_timeout may run late:
+	def _tick( self ):
+		now = monotonic()
+		ticks = max( 1, int( (now - self.last) * 1000 // self.tick_ms ) )
+		self.last += ticks * self.tick_ms / 1000
+		for _ in range( min( ticks, len( self.slots ) * 2 ) ):
+			self.cursor = (self.cursor + 1) % len( self.slots )
+			self._expire( self.slots[self.cursor] )
+
+		if self.count: self.schedule( self._tick, self.tick_ms )
+		else: self.last = None
+
+	# A callback may cancel timers due in the same slot, skip those:
+	def _expire( self, slot ):
+		due = [t for t in slot if not t.rounds]
+		for t in slot: t.rounds -= 1
+		for t in due:
+			if t not in slot: continue
+			slot.discard( t )
+			self.count -= 1
+			t.fn()